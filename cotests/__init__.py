@@ -1,4 +1,35 @@
-from .batch import bench_batch, test_batch
-from .case import CoTestCase
-from .cases import CoTestGroup, test_groups
-from .module import test_module
+# without `typing`: it is imported by the first feature
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .batch import bench_batch, test_batch
+    from .case import CoTestCase
+    from .cases import CoTestGroup, Grid, Source, fixture, test_groups
+    from .module import list_tests, test_module
+
+# name: module; imported on first use, so `import cotests` is cheap
+_EXPORTS = {
+    'bench_batch': '.batch',
+    'test_batch': '.batch',
+    'CoTestCase': '.case',
+    'CoTestGroup': '.cases',
+    'Grid': '.cases',
+    'Source': '.cases',
+    'fixture': '.cases',
+    'test_groups': '.cases',
+    'list_tests': '.module',
+    'test_module': '.module',
+}
+__all__ = tuple(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from importlib import import_module
+    value = getattr(import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_EXPORTS})
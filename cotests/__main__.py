@@ -0,0 +1,130 @@
+import os
+import sys
+from argparse import ArgumentParser
+
+from cotests import list_tests, test_module
+from cotests.cases.utils.options import DEFAULT_HISTORY_PATH, DEFAULT_TIMINGS_PATH, ORDERS
+
+
+def compare(argv):
+    from cotests.cases.runner.utils.history import load_history, find_run, compare_runs
+    from cotests.cases.runner.utils.printer import format_sec_metrix
+    from cotests.logger import logger
+
+    parser = ArgumentParser(prog='cotests compare', description='Compare benchmark run with baseline run')
+    parser.add_argument('baseline', help='tag or index of the baseline run')
+    parser.add_argument('run', nargs='?', default='-1', help='tag or index of the run; default: last')
+    parser.add_argument('-f', '--history', default=DEFAULT_HISTORY_PATH, help='history file')
+    parser.add_argument('-t', '--threshold', type=float, default=5., help='allowed slowdown, percent')
+    parser.add_argument('-m', '--metric', help='compared stat; default: median, avg or time')
+    args = parser.parse_args(argv)
+
+    try:
+        runs = load_history(args.history)
+        base, run = find_run(runs, args.baseline), find_run(runs, args.run)
+    except (OSError, LookupError) as e:
+        parser.error(str(e))
+
+    diffs, new, removed = compare_runs(base, run, args.metric)
+    logger.writeln(f'Compare {run["date"]} ({run["tag"]}) with {base["date"]} ({base["tag"]})')
+    regressions = 0
+    for name, b, c, change in diffs:
+        mark = ''
+        if change > args.threshold:
+            regressions += 1
+            mark = ' REGRESSION'
+        logger.child.writeln(f'* {name}: {format_sec_metrix(b)} -> {format_sec_metrix(c)} ({change:+.1f}%){mark}')
+    for name in new:
+        logger.child.writeln(f'* {name}: new')
+    for name in removed:
+        logger.child.writeln(f'* {name}: removed')
+    logger.writeln(f'{regressions} regression(s) over {args.threshold}%')
+    return 1 if regressions else 0
+
+
+def merge(argv):
+    from cotests.cases.runner.utils.shard import merge_reports, print_report, write_report
+
+    parser = ArgumentParser(prog='cotests merge', description='Merge result files of shards as a single run')
+    parser.add_argument('reports', nargs='+', metavar='FILE', help='result files of all shards')
+    parser.add_argument('-o', '--output', metavar='FILE', help='write merged result file')
+    parser.add_argument('--timings', nargs='?', const=DEFAULT_TIMINGS_PATH, metavar='FILE',
+                        help='update durations & outcomes of tests: balance of next shards')
+    args = parser.parse_args(argv)
+
+    try:
+        result = merge_reports(args.reports)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    print_report(result, len(args.reports))
+    if args.output:
+        write_report(args.output, (1, 1), [c.name for c in result.children], result)
+    if args.timings:
+        from cotests.cases.runner.utils.timings import Timings
+        timings = Timings(args.timings)
+        timings.update(result)
+        timings.save()
+    return 0 if result.ok else 1
+
+
+def main():
+    if sys.argv[1:2] == ['compare']:
+        sys.exit(compare(sys.argv[2:]))
+    if sys.argv[1:2] == ['merge']:
+        sys.exit(merge(sys.argv[2:]))
+
+    parser = ArgumentParser(prog='cotests', description='Run all tests in the directory')
+    parser.add_argument('dir_path', nargs='?', default=os.getcwd())
+    parser.add_argument('-p', '--file-prefix', default='t_', help='prefix of test files')
+    parser.add_argument('-i', '--ignore', action='append', metavar='FILE', help='ignore test file')
+    parser.add_argument('-w', '--workers', type=int, default=1, help='run test files in N processes')
+    parser.add_argument('-r', '--recursive', action='store_true', help='search in subdirectories too')
+    parser.add_argument('--include', action='append', metavar='GLOB', help='only test files by relative path')
+    parser.add_argument('--exclude', action='append', metavar='GLOB', help='skip test files by relative path')
+    parser.add_argument('-k', '--select', action='append', metavar='GLOB', help='only tests by id: <path>::<name>')
+    parser.add_argument('--index', nargs='?', const=True, default=False, metavar='FILE',
+                        help='keep tests of each file: list & select without import')
+    parser.add_argument('--list', action='store_true', help='print ids of tests from the index and exit')
+    parser.add_argument('--profile', nargs='?', const=True, default=False, metavar='DIR',
+                        help='write cProfile stats of each test')
+    parser.add_argument('--incremental', nargs='?', const=True, default=False, metavar='FILE',
+                        help='skip test files not changed since the last run without errors')
+    parser.add_argument('--order', choices=ORDERS, default='declared',
+                        help='order of tests by the last run: failed, slowest or fastest first')
+    parser.add_argument('--timings', nargs='?', const=True, default=False, metavar='FILE',
+                        help='keep durations & outcomes of tests for order')
+    parser.add_argument('--shard', metavar='i/N', help='run only test files of shard i of N, from 1')
+    parser.add_argument('--report', metavar='FILE', help='write result file; default with shard: '
+                                                         '.cotests/shard-i-of-N.json')
+    args = parser.parse_args()
+    discovery = dict(
+        file_prefix=args.file_prefix,
+        ignore_files=args.ignore,
+        recursive=args.recursive,
+        include=args.include,
+        exclude=args.exclude,
+        select=args.select,
+    )
+
+    if args.list:
+        for test_id in list_tests(args.dir_path, index=args.index or True, **discovery):
+            print(test_id)
+        return
+
+    test_module(
+        args.dir_path,
+        **discovery,
+        index=args.index,
+        workers=args.workers,
+        profile=args.profile,
+        incremental=args.incremental,
+        order=args.order,
+        timings=args.timings,
+        shard=args.shard,
+        report=args.report,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -3,23 +3,26 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from .cases.group import CoTestGroup
+from .cases.utils.options import BenchOptions, TestOptions
 
 if TYPE_CHECKING:
-    from .typ import InTest, Unpack, TestParamsName
+    from .typ import InTest, Unpack, RunParamsName, BenchParamsName
 
 
 def test_batch(
         *funcs: 'InTest',
-        **kwargs: Unpack[TestParamsName],
+        **kwargs: Unpack[RunParamsName],
 ):
-    return CoTestGroup(*funcs, **kwargs).run_test()
+    run_kwargs = TestOptions.split_kwargs(kwargs)
+    return CoTestGroup(*funcs, **kwargs).run_test(**run_kwargs)
 
 def bench_batch(
         *funcs: 'InTest',
         iterations: int = 1,
-        **kwargs: Unpack[TestParamsName],
+        **kwargs: Unpack[BenchParamsName],
 ):
-    return CoTestGroup(*funcs, **kwargs).run_bench(iterations)
+    bench_kwargs = BenchOptions.split_kwargs(kwargs)
+    return CoTestGroup(*funcs, **kwargs).run_bench(iterations, **bench_kwargs)
 
 
 __all__ = ('test_batch', 'bench_batch',)
@@ -3,10 +3,11 @@ from __future__ import annotations
 from typing import TYPE_CHECKING, Optional, Callable
 
 import cotests.cases
+from cotests.cases.utils.options import BenchOptions, TestOptions
 from .abstract import AbstractCoCase
 
 if TYPE_CHECKING:
-    from cotests.typ import Unpack, TestParamsCase, TestParamsFull
+    from cotests.typ import Unpack, RunParamsCase, TestParamsFull, BenchParamsCase
 
 
 class CoTestCase(AbstractCoCase):
@@ -50,11 +51,13 @@ class CoTestCase(AbstractCoCase):
                     del kwargs['cotest_ext']
         return kwargs
 
-    def run_test(self, **kwargs: Unpack[TestParamsCase]):
-        return self.create_group(**kwargs).run_test()
+    def run_test(self, **kwargs: Unpack[RunParamsCase]):
+        run_kwargs = TestOptions.split_kwargs(kwargs)
+        return self.create_group(**kwargs).run_test(**run_kwargs)
 
     def run_bench(self,
                   iterations: int = 1,
-                  **kwargs: Unpack[TestParamsCase],
+                  **kwargs: Unpack[BenchParamsCase],
                   ):
-        return self.create_group(**kwargs).run_bench(iterations)
+        bench_kwargs = BenchOptions.split_kwargs(kwargs)
+        return self.create_group(**kwargs).run_bench(iterations, **bench_kwargs)
@@ -1 +1,4 @@
 from .group import CoTestGroup, test_groups
+from .utils.fixture import fixture
+from .utils.grid import Grid
+from .utils.source import Source
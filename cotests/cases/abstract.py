@@ -1,27 +1,38 @@
-from typing import TYPE_CHECKING, List, Type
+from typing import TYPE_CHECKING, List, Type, Optional, Hashable
 from .runner.group import GroupRunner
 
 if TYPE_CHECKING:
     from .runner.abstract import AbstractRunner
+    from cotests.typ import BenchParams, RunParams, Unpack
 
 
 class AbstractTestCase:
     is_async: bool
     name: str
     _RUNNER: Type['AbstractRunner']
+    baseline_key: Optional[Hashable] = None
+    # input size, with sweep
+    size: Optional[int] = None
 
-    def run_test(self):
+    def run_test(self, **kwargs: 'Unpack[RunParams]'):
         raise NotImplementedError
-    def run_bench(self, iterations: int):
+    def run_bench(self, iterations: int, **kwargs: 'Unpack[BenchParams]'):
         raise NotImplementedError
     def get_runner(self, parent: 'AbstractRunner') -> 'AbstractRunner':
         return self._RUNNER(self, parent)
+    def null_case(self) -> Optional['AbstractTestCase']:
+        """Empty test with the same call shape, for baseline measurement"""
+        return None
 
 
 class AbstractTestGroup(AbstractTestCase):
     is_empty: bool
     init_errors: List[Exception]
     tests: List[AbstractTestCase]
+    # group of test file: scope of module fixtures
+    is_module = False
+    # all cases can be created at once: to reorder them by timings
+    is_finite = True
     _RUNNER = GroupRunner
     def constructor(self): ...
     def destructor(self): ...
@@ -1,49 +1,109 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Callable, Hashable, Awaitable
 
 from .abstract import AbstractTestCase
 from .runner.case import CaseRunner, AsyncCaseRunner
 from .utils.case_ext import TestCaseExt
+from .utils.source import cycle_params
 
 if TYPE_CHECKING:
     from cotests.typ import CoArgsList
 
 
 class TestCase(AbstractTestCase):
+    # can run the test several times per timing sample
+    can_loop = True
+    # can run concurrent calls for load benchmark
+    can_load = False
+    # can run calls in threads for thread-scaling benchmark
+    can_thread = False
+
     def __init__(self,
                  test,
                  *,
                  params: 'CoArgsList',
                  ext: Optional[TestCaseExt] = None,
+                 size: Optional[int] = None,
+                 label: Optional[str] = None,
+                 shape: Optional['CoArgsList'] = None,
                  ):
         self._f = test
         self._params = params
         self._ext = ext or TestCaseExt()
+        self.size = size
+        # grid point
+        self.label = label
+        # params of the same call shape: sweep & grid cases share the baseline
+        self._shape = shape or params
+        # calls per timing sample
+        self.loops = 1
+
+    @property
+    def base_name(self) -> str:
+        """Name without input size"""
+        if self.label is None:
+            return self._f.__name__
+        return f'{self._f.__name__}[{self.label}]'
 
     @property
     def name(self) -> str:
-        return self._f.__name__
+        if self.size is None:
+            return self.base_name
+        return f'{self.base_name}[{self.size}]'
+
+    @property
+    def baseline_key(self) -> Hashable:
+        # cases with the same class & params have the same baseline
+        return type(self), id(self._shape)
+
+    def _null_function(self) -> Callable:
+        raise NotImplementedError
+
+    def null_case(self) -> 'TestCase':
+        return type(self)(self._null_function(), params=self._params, ext=self._ext)
+
+
+# empty tests for baseline
+def null(*_, **__): ...
+async def null_async(*_, **__): ...
+
 
 class FunctionTestCase(TestCase):
     is_async = False
+    can_thread = True
     _RUNNER = CaseRunner
 
+    def _null_function(self):
+        return null
+
     def run_test(self) -> float:
         return sum(
-            self._ext.decor(self._f)(*p[0], **p[1])
+            self._ext.decor(self._f, self.loops)(*p[0], **p[1])
             for p in self._params
         )
 
+    def get_call(self) -> Callable[[], None]:
+        """Single call without pre & post test; arguments in turn"""
+        params = cycle_params(self._params)
+
+        def call():
+            args, kwargs = next(params)
+            self._f(*args, **kwargs)
+        return call
+
 
 class AsyncTestCase(TestCase):
     is_async = True
     _RUNNER = AsyncCaseRunner
 
+    def _null_function(self):
+        return null_async
+
     async def _run(self, *args, **kwargs):
         await self._f(*args, **kwargs)
 
     async def _bench_single(self) -> float:
         return sum([
-            await self._ext.decor_async(self._run, True)(*p[0], **p[1])
+            await self._ext.decor_async(self._run, True, loops=self.loops)(*p[0], **p[1])
             for p in self._params
         ])
 
@@ -52,14 +112,19 @@ class AsyncTestCase(TestCase):
 
 
 class FunctionTestCaseWithAsyncPrePost(AsyncTestCase):
+    def _null_function(self):
+        return null
+
     async def _bench_single(self) -> float:
         return sum([
-            await self._ext.decor_async(self._f, False)(*p[0], **p[1])
+            await self._ext.decor_async(self._f, False, loops=self.loops)(*p[0], **p[1])
             for p in self._params
         ])
 
 
 class CoroutineTestCase(AsyncTestCase):
+    can_loop = False
+
     def __init__(self, *args, **kwargs):
         assert kwargs['params'] == [((), {})], 'Coroutine with args'
         super().__init__(*args, **kwargs)
@@ -67,6 +132,18 @@ class CoroutineTestCase(AsyncTestCase):
     def _run(self, *_, **__):
         return self._f
 
+    def null_case(self) -> 'TestCase':
+        return CoroutineFunctionTestCase(null_async, params=self._params, ext=self._ext)
+
 
 class CoroutineFunctionTestCase(AsyncTestCase):
-    ...
+    can_load = True
+
+    def get_call(self) -> Callable[[], Awaitable]:
+        """Single call without pre & post test; arguments in turn"""
+        params = cycle_params(self._params)
+
+        def call():
+            args, kwargs = next(params)
+            return self._f(*args, **kwargs)
+        return call
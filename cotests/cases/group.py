@@ -1,6 +1,8 @@
 import inspect
-import unittest
-from typing import TYPE_CHECKING, Optional, Iterable, List, Type
+import sys
+from functools import partial
+from itertools import chain
+from typing import TYPE_CHECKING, Any, Callable, Optional, Iterable, Iterator, List, Type, Union
 
 from cotests.case.case import CoTestCase
 from cotests.exceptions import UnknownTestTypeError
@@ -9,15 +11,42 @@ from .cases import (
     CoroutineTestCase, CoroutineFunctionTestCase, FunctionTestCase, FunctionTestCaseWithAsyncPrePost
 )
 from .runner import RootGroupRunner
-from .unit_case import UnitTestCase
 from .utils.args import CoTestArgs
 from .utils.case_ext import TestCaseExt
+from .utils.grid import Grid
+from .utils.source import map_params
+from .utils.options import BenchOptions, TestOptions
 
 if TYPE_CHECKING:
-    from cotests.typ import InTest, TestArgs, TestKwargs, TestCallable
+    from cotests.typ import CoArgsList, InTest, TestArgs, TestKwargs, TestCallable, Unpack, BenchParams, RunParams
     from .cases import TestCase
 
 
+def is_unittest_class(cls: type) -> bool:
+    # a subclass of `unittest.TestCase` exists only if unittest is imported
+    unittest = sys.modules.get('unittest')
+    return unittest is not None and issubclass(cls, unittest.TestCase)
+
+
+class LazyCases:
+    """
+    Cases created while iterating: of the function; of the test file.
+    Not finite ones (grid & sweep points) are not created at once
+    """
+    def __init__(
+            self,
+            factory: Callable[[], Iterator['AbstractTestCase']],
+            is_async: bool = False,
+            is_finite: bool = True,
+    ):
+        self.__factory = factory
+        self.is_async = is_async
+        self.is_finite = is_finite
+
+    def __iter__(self):
+        return self.__factory()
+
+
 class CoTestGroup(AbstractTestGroup):
     NAME = ''
 
@@ -36,10 +65,14 @@ class CoTestGroup(AbstractTestGroup):
 
             constructor: Optional['TestCallable'] = None,
             destructor: Optional['TestCallable'] = None,
+
+            sweep: Optional[Iterable[int]] = None,
+            sweep_input: Optional[Callable[[int], Any]] = None,
+            grid: Optional[Grid] = None,
     ):
         # if len(tests) == 0:
         #     raise ValueError('Empty tests list')
-        self.__tests: List['AbstractTestCase'] = []
+        self.__tests: List[Union['AbstractTestCase', LazyCases]] = []
         self.__has_coroutines = False
         self.name = name or self.NAME
         self._init_errors = []
@@ -66,6 +99,14 @@ class CoTestGroup(AbstractTestGroup):
                 post_test=post_test,
             )
 
+        # sizes & factory of input: first argument of each function, built with its case
+        if sweep:
+            assert sweep_input, 'Sweep without input factory'
+            self.__sweep = (tuple(sweep), sweep_input)
+        else:
+            self.__sweep = None
+        self.__grid = grid
+
         if constructor:
             try:
                 self.constructor = self.__check_ac(constructor)
@@ -112,8 +153,15 @@ class CoTestGroup(AbstractTestGroup):
         return self._init_errors
 
     @property
-    def tests(self):
-        return iter(self.__tests)
+    def tests(self) -> Iterator['AbstractTestCase']:
+        return chain.from_iterable(
+            t if isinstance(t, LazyCases) else (t,)
+            for t in self.__tests
+        )
+
+    @property
+    def is_finite(self) -> bool:
+        return all(not isinstance(t, LazyCases) or t.is_finite for t in self.__tests)
 
     def __get_function_test_case(self, test: 'InTest') -> Optional[Type['TestCase']]:
         if inspect.iscoroutine(test):
@@ -147,36 +195,61 @@ class CoTestGroup(AbstractTestGroup):
         else:
             tc = self.__get_function_test_case(test)
             if tc:
+                params = self.__cta.get(args, kwargs)
+                if (self.__sweep or self.__grid) and tc is not CoroutineTestCase:
+                    return self.__add_test_case(LazyCases(
+                        partial(self.__expand, tc, test, params), tc.is_async, is_finite=False,
+                    ))
                 return self.__add_test_case(tc(
                     test,
-                    params=self.__cta.get(args, kwargs),
+                    params=params,
                     ext=self.__tce,
                 ))
-            elif isinstance(test, CoTestGroup):
+            elif isinstance(test, (CoTestGroup, LazyCases)):
                 return self.__add_test_case(test)
             elif isinstance(test, CoTestCase):
                 return self.__add_test_case(self._clone(test))
             elif inspect.isclass(test):
                 if issubclass(test, CoTestCase):
                     return self.__add_test_case(self._clone(test()))
-                if issubclass(test, unittest.TestCase):
+                if is_unittest_class(test):
+                    from .unit_case import UnitTestCase
                     return self.__add_test_case(UnitTestCase(test))
 
             raise UnknownTestTypeError(f'Unknown test: {type(test)} {test}')
 
-    def __add_test_case(self, case: AbstractTestCase):
+    def __expand(self, tc: Type['TestCase'], test: Callable, params: 'CoArgsList') -> Iterator['TestCase']:
+        """Case for each grid point & input size"""
+        for point in self.__grid or (None,):
+            if point is None:
+                p, label = params, None
+            else:
+                label = Grid.label(point)
+                p = map_params(params, lambda ak, pt=point: (ak[0], {**ak[1], **pt}))
+            for n in self.__sweep[0] if self.__sweep else (None,):
+                if n is not None:
+                    x = self.__sweep[1](n)
+                yield tc(
+                    test,
+                    params=p if n is None else map_params(p, lambda ak, x=x: ((x, *ak[0]), ak[1])),
+                    ext=self.__tce,
+                    size=n,
+                    label=label,
+                    shape=params,
+                )
+
+    def __add_test_case(self, case: Union[AbstractTestCase, LazyCases]):
         if case.is_async:
             self.__has_coroutines = True
         self.__tests.append(case)
 
-    def run_test(self):
-        return RootGroupRunner(self).run()
+    def run_test(self, **kwargs: 'Unpack[RunParams]'):
+        return RootGroupRunner(self).run(TestOptions(**kwargs))
 
-    def run_bench(self, iterations: int):
-        assert iterations >= 1, 'Incorrect iterations count'
-        return RootGroupRunner(self).bench(iterations)
+    def run_bench(self, iterations: int = 1, **kwargs: 'Unpack[BenchParams]'):
+        return RootGroupRunner(self).bench(BenchOptions(iterations, **kwargs))
 
 
-def test_groups(*groups: CoTestGroup, name='__main__'):
+def test_groups(*groups: CoTestGroup, name='__main__', **kwargs: 'Unpack[RunParams]'):
     g = CoTestGroup(*groups, name=name)
-    return g.run_test()
+    return g.run_test(**kwargs)
@@ -1,8 +1,12 @@
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from .utils.result import CaseResult
 
 if TYPE_CHECKING:
     from ..abstract import AbstractTestCase
     from cotests.logger import CoLogger
+    from ..utils.options import BenchOptions, TestOptions
+    from .utils.result import GroupResult
 
 
 class AbstractRunner:
@@ -12,6 +16,7 @@ class AbstractRunner:
                  ):
         self.test = test
         self.parent = parent
+        self.result: Union[CaseResult, 'GroupResult'] = CaseResult(test.name)
 
     @property
     def logger(self) -> 'CoLogger':
@@ -20,8 +25,17 @@ class AbstractRunner:
     @property
     def is_async(self): return self.test.is_async
 
-    def run(self): raise NotImplementedError
-    def bench(self, iterations: int): raise NotImplementedError
+    @property
+    def root(self) -> 'AbstractRunner':
+        return self.parent.root if self.parent else self
+
+    @property
+    def path(self) -> Tuple[str, ...]:
+        """Names of groups from the root"""
+        return (*self.parent.path, self.parent.test.name) if self.parent else ()
+
+    def run(self, options: 'TestOptions'): raise NotImplementedError
+    def bench(self, options: 'BenchOptions'): raise NotImplementedError
 
 
 __all__ = ('AbstractRunner', )
@@ -1,19 +1,93 @@
-from time import perf_counter
-from typing import TYPE_CHECKING, List
+from array import array
+from contextlib import nullcontext
+from itertools import count
+from math import sqrt
+from time import perf_counter, process_time, thread_time
+from typing import TYPE_CHECKING, Any, ContextManager, Dict, Iterator, Sequence, List, Optional, Union, Tuple
 
 from cotests.exceptions import CoException
 from .abstract import AbstractRunner
+from .utils.gc_control import GcMonitor, gc_mode
+from .utils.memory import MemoryUsage, trace_memory
+from .utils.profile import profile_path, profile_to, StackSampler
 from .utils.printer import format_sec_metrix
 from .utils.progress_bar import ProgressBarPrinter
 
 if TYPE_CHECKING:
     from ..cases import TestCase
+    from ..utils.options import BenchOptions, TestOptions
+
+
+def _loops_range() -> Iterator[int]:
+    # 1, 2, 5, 10, 20, 50, ... like timeit.Timer.autorange
+    for i in count():
+        for j in (1, 2, 5):
+            yield j * 10 ** i
+
+
+class Warmup:
+    """
+    Counter of warmup iterations.
+    `auto` - until coefficient of variation of last samples stops changing.
+    """
+    WINDOW = 10
+    CV_DELTA = .02
+    # limits of auto mode
+    MAX_ITERATIONS = 1000
+    MAX_TIME = 1.
+
+    def __init__(self, iterations: Union[int, str]):
+        self.__auto = iterations == 'auto'
+        self.__max = self.MAX_ITERATIONS if self.__auto else iterations
+        self.__samples: List[float] = []
+        self.__time = .0
+
+    @property
+    def count(self) -> int:
+        return len(self.__samples)
+
+    @staticmethod
+    def __cv(samples: List[float]) -> float:
+        mean = sum(samples) / len(samples)
+        if not mean:
+            return .0
+        return sqrt(sum((x - mean) ** 2 for x in samples) / (len(samples) - 1)) / mean
+
+    def __is_steady(self) -> bool:
+        w = self.WINDOW
+        if len(self.__samples) < w * 2:
+            return False
+        return abs(self.__cv(self.__samples[-w:]) - self.__cv(self.__samples[-w * 2:-w])) < self.CV_DELTA
+
+    def add(self, sample: float) -> bool:
+        """Add warmup sample; return True, if more iterations are needed"""
+        self.__samples.append(sample)
+        self.__time += sample
+        if self.count >= self.__max:
+            return False
+        if self.__auto:
+            return self.__time < self.MAX_TIME and not self.__is_steady()
+        return True
+
+
+class CpuClock:
+    """Process & thread CPU time against wall time of the same interval"""
+    def __init__(self):
+        self.__start = perf_counter(), process_time(), thread_time()
+
+    def stop(self, calls: int) -> Tuple[float, float, float]:
+        """:return: process & thread time per call, CPU utilization (%)"""
+        wall, proc, thread = (
+            finish - start for finish, start in zip((perf_counter(), process_time(), thread_time()), self.__start)
+        )
+        return proc / calls, thread / calls, proc / wall * 100 if wall else .0
 
 
 class CaseCTX:
     def __init__(self, runner: 'CaseRunner'):
         self.__runner = runner
         self.__start = .0
+        self.memory: Optional[MemoryUsage] = None
 
     @property
     def logger(self): return self.__runner.logger
@@ -26,33 +100,233 @@ class CaseCTX:
 
     def __exit__(self, *exc):
         finish = perf_counter()
+        self.__runner.result.time = finish - self.__start
         if any(exc):
             self.logger.end_line(f'error: {exc[1]}')
             raise CoException([exc[1]], self.__runner.test.name)
         else:
-            self.logger.end_line(f'ok - {format_sec_metrix(finish - self.__start)}')
+            line = f'ok - {format_sec_metrix(finish - self.__start)}'
+            if self.memory:
+                line += f'; {self.memory}'
+            self.logger.end_line(line)
+
+    def print_loops(self, loops: int):
+        self.logger.write_raw(f'({loops} loops)')
+        self.logger.flush()
+
+    def print_warmup(self, count: int):
+        self.logger.write_raw(f'(warmup {count})')
+        self.logger.flush()
+
+    def print_load(self, level: str):
+        self.logger.write_raw(f'[{level}]')
+        self.logger.flush()
 
 
 class CaseRunner(AbstractRunner):
     test: 'TestCase'
+    # measured with samples; sent from isolated processes
+    STATE = ('cold', 'memory', 'cpu', 'gc')
 
-    def run(self) -> float:
-        with CaseCTX(self):
-            return self.test.run_test()
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # first call time, with warmup
+        self.cold: Optional[float] = None
+        # mean stdev inside process & stdev between processes, with isolate
+        self.spread: Optional[Tuple[float, float]] = None
+        # single call, with memory
+        self.memory: Optional[MemoryUsage] = None
+        # process & thread time per sample, CPU utilization (%), with cpu
+        self.cpu: Optional[Tuple[float, float, float]] = None
+        # collections of generations 0-2 & GC pause time while timing, with gc
+        self.gc: Optional[Tuple[int, int, int, float]] = None
 
-    def bench(self, iterations: int) -> List[float]:
-        pb = ProgressBarPrinter(iterations, logger=self.logger)
-        with CaseCTX(self):
-            return [self.test.run_test() for _ in pb]
+    @property
+    def state(self) -> Dict[str, Any]:
+        return {k: getattr(self, k) for k in self.STATE}
+
+    @staticmethod
+    def _gc_mode(options: 'BenchOptions') -> ContextManager[Optional[GcMonitor]]:
+        # after calibration & warmup: only timing loop
+        return gc_mode(options.gc) if options.gc else nullcontext()
+
+    def _sampling(self, options: 'BenchOptions') -> ContextManager:
+        if not options.sampling:
+            return nullcontext()
+        return StackSampler(
+            options.sampling_interval,
+            profile_path(options.sampling, self.path, self.test.name, '.collapsed'),
+        )
+
+    def profile_file(self, options: 'TestOptions') -> str:
+        return profile_path(options.profile, self.path, self.test.name)
+
+    def run(self, options: 'TestOptions') -> float:
+        with CaseCTX(self) as ctx:
+            res = self.test.run_test()
+            self._trace(options, ctx)
+            return res
+
+    def _trace(self, options: 'TestOptions', ctx: CaseCTX):
+        # separate passes: profiler & tracing slow calls down
+        if options.profile and self.test.can_loop:
+            with profile_to(self.profile_file(options)):
+                self.test.run_test()
+        if options.memory and self.test.can_loop:
+            self.memory = ctx.memory = self._trace_memory()
+
+    def _trace_memory(self) -> MemoryUsage:
+        self.test.loops = 1
+        with trace_memory() as memory:
+            self.test.run_test()
+        return memory
+
+    def _calibrate(self, min_time: float) -> int:
+        for loops in _loops_range():
+            self.test.loops = loops
+            if self.test.run_test() * loops >= min_time:
+                return loops
+
+    def _warmup(self, warmup: Warmup):
+        while warmup.add(self.test.run_test()):
+            ...
+
+    def bench(self, options: 'BenchOptions') -> Sequence[float]:
+        try:
+            return self._bench(options)
+        finally:
+            # calibrated loops are only for this benchmark
+            self.test.loops = 1
+
+    def _bench(self, options: 'BenchOptions') -> Sequence[float]:
+        pb = ProgressBarPrinter(options.iterations, logger=self.logger)
+        with CaseCTX(self) as ctx:
+            warmup = options.warmup and self.test.can_loop
+            if warmup:
+                # first call is cold
+                self.cold = self.test.run_test()
+            if options.calibrate and self.test.can_loop:
+                ctx.print_loops(self._calibrate(options.calibrate))
+            if warmup:
+                warmup = Warmup(options.warmup)
+                if warmup.add(self.cold):
+                    self._warmup(warmup)
+                ctx.print_warmup(warmup.count)
+            with self._gc_mode(options) as gc_monitor:
+                cpu = options.cpu and CpuClock()
+                res = array('d', (self.test.run_test() for _ in pb))
+                if cpu:
+                    self.cpu = cpu.stop(options.iterations * self.test.loops)
+            if gc_monitor:
+                self.gc = gc_monitor.row
+            # separate passes: sampler, profiler & tracing slow calls down
+            if options.sampling and self.test.can_loop:
+                with self._sampling(options):
+                    for _ in range(options.iterations):
+                        self.test.run_test()
+            self._trace(options, ctx)
+            return res
+
+    def threads(self, options: 'BenchOptions') -> List[Tuple[int, float, Sequence[float]]]:
+        """
+        Calls in thread pool on each threads count
+        :return: [(threads, full time, latencies)]
+        """
+        from .utils.load import thread_loop
+        res = []
+        with CaseCTX(self) as ctx:
+            for threads in options.threads:
+                res.append((threads, *thread_loop(
+                    self.test.get_call,
+                    threads,
+                    duration=options.load_duration,
+                    requests=options.load_requests,
+                )))
+                ctx.print_load(f't{threads}')
+        return res
 
 
 class AsyncCaseRunner(CaseRunner):
 
-    async def run(self) -> float:
-        with CaseCTX(self):
-            return await self.test.run_test()
+    async def run(self, options: 'TestOptions') -> float:
+        with CaseCTX(self) as ctx:
+            res = await self.test.run_test()
+            await self._trace(options, ctx)
+            return res
+
+    async def _trace(self, options: 'TestOptions', ctx: CaseCTX):
+        if options.profile and self.test.can_loop:
+            with profile_to(self.profile_file(options)):
+                await self.test.run_test()
+        if options.memory and self.test.can_loop:
+            self.memory = ctx.memory = await self._trace_memory()
+
+    async def _trace_memory(self) -> MemoryUsage:
+        self.test.loops = 1
+        with trace_memory() as memory:
+            await self.test.run_test()
+        return memory
+
+    async def _calibrate(self, min_time: float) -> int:
+        for loops in _loops_range():
+            self.test.loops = loops
+            if await self.test.run_test() * loops >= min_time:
+                return loops
+
+    async def _warmup(self, warmup: Warmup):
+        while warmup.add(await self.test.run_test()):
+            ...
+
+    async def bench(self, options: 'BenchOptions') -> Sequence[float]:
+        try:
+            return await self._bench(options)
+        finally:
+            self.test.loops = 1
+
+    async def _bench(self, options: 'BenchOptions') -> Sequence[float]:
+        pb = ProgressBarPrinter(options.iterations, logger=self.logger)
+        with CaseCTX(self) as ctx:
+            warmup = options.warmup and self.test.can_loop
+            if warmup:
+                # first call is cold
+                self.cold = await self.test.run_test()
+            if options.calibrate and self.test.can_loop:
+                ctx.print_loops(await self._calibrate(options.calibrate))
+            if warmup:
+                warmup = Warmup(options.warmup)
+                if warmup.add(self.cold):
+                    await self._warmup(warmup)
+                ctx.print_warmup(warmup.count)
+            res = array('d')
+            with self._gc_mode(options) as gc_monitor:
+                cpu = options.cpu and CpuClock()
+                for _ in pb:
+                    res.append(await self.test.run_test())
+                if cpu:
+                    self.cpu = cpu.stop(options.iterations * self.test.loops)
+            if gc_monitor:
+                self.gc = gc_monitor.row
+            if options.sampling and self.test.can_loop:
+                with self._sampling(options):
+                    for _ in range(options.iterations):
+                        await self.test.run_test()
+            await self._trace(options, ctx)
+            return res
 
-    async def bench(self, iterations: int) -> List[float]:
-        pb = ProgressBarPrinter(iterations, logger=self.logger)
-        with CaseCTX(self):
-            return [await self.test.run_test() for _ in pb]
+    async def load(self, options: 'BenchOptions') -> List[Tuple[int, float, Sequence[float]]]:
+        """
+        Closed-loop load on each concurrency level
+        :return: [(concurrency, full time, latencies)]
+        """
+        from .utils.load import closed_loop
+        res = []
+        with CaseCTX(self) as ctx:
+            for concurrency in options.load:
+                res.append((concurrency, *await closed_loop(
+                    self.test.get_call(),
+                    concurrency,
+                    duration=options.load_duration,
+                    requests=options.load_requests,
+                )))
+                ctx.print_load(f'x{concurrency}')
+        return res
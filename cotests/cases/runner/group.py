@@ -1,26 +1,48 @@
-from contextlib import contextmanager
+import os
+from array import array
+from contextlib import ExitStack, contextmanager
+from itertools import chain
 from time import perf_counter
-from typing import TYPE_CHECKING, List, Tuple, Type, Coroutine, Callable
+from typing import TYPE_CHECKING, Any, Iterator, List, Tuple, Type, Coroutine, Callable, Dict, Hashable, Optional, Sequence
 
-from cotests.exceptions import CoException, InitGroupErrors
-from cotests.logger import logger
+from cotests.exceptions import CoException, InitGroupErrors, error_type_name
+from cotests.logger import logger, capture
 from .abstract import AbstractRunner
+from .case import CaseRunner
+from .utils.complexity import MIN_SIZES, fit_complexity
+from .utils.pool import can_fork, fork_pool, run_child, bench_child
 from .utils.printer import format_sec_metrix, print_test_results
+from .utils.profile import top_functions
+from .utils.result import CaseResult, GroupResult
+from .utils.stats import Stats, process_spread
+from ..utils.fixture import FixtureStore, set_group, reset_group
 from ..utils.ttr import run_fun, try_to_run
 
 if TYPE_CHECKING:
+    from contextvars import Token
     from ..abstract import AbstractTestCase, AbstractTestGroup
+    from ..utils.options import BenchOptions, TestOptions
+    from .utils.complexity import Fit
+    from .utils.export import Exporter
+    from .utils.pool import ChildResult, ChildBenchResult
+    from .utils.timings import Timings
+
+
+# samples & runner state of benchmark in one process
+BenchPart = Tuple[Sequence[float], Dict[str, Any]]
 
 
 class GroupTestCTX:
     _GREETINGS: str = 'CoTest'
     START_LINE = '-' * 14
 
-    def __init__(self, cls: 'GroupRunner'):
+    def __init__(self, cls: 'GroupRunner', options: 'TestOptions'):
         self._runner = cls
+        self._options = options
         self.__start: float = .0
         self.__finish: float = .0
-        self._runners = [test.get_runner(cls) for test in self.test.tests]
+        self.__runners_list: Optional[List['AbstractRunner']] = None
+        self.__token: Optional['Token'] = None
 
     @property
     def test(self):
@@ -30,42 +52,155 @@ class GroupTestCTX:
     def logger(self):
         return self._runner.logger
 
+    @property
+    def _runners(self) -> Iterator['AbstractRunner']:
+        if self.__runners_list is not None:
+            return iter(self.__runners_list)
+        # created while running: grid cases & test files are expanded lazily
+        runners = (test.get_runner(self._runner) for test in self.test.tests)
+        timings = self._runner.root.timings
+        # grid & sweep cases stay lazy: declared order
+        if timings and self._options.order != 'declared' and self.test.is_finite:
+            self.__runners_list = timings.sort(runners, self._options.order)
+            return iter(self.__runners_list)
+        return runners
+
+    @property
+    def _runners_list(self) -> List['AbstractRunner']:
+        """All runners at once, for parallel & concurrent runs"""
+        if self.__runners_list is None:
+            self.__runners_list = list(self._runners)
+        return self.__runners_list
+
     def __enter__(self):
+        self.__token = set_group(self._runner)
         self.test.constructor()
         self.__pre()
         self.run()
         return self
 
     def __exit__(self, *args):
+        # fixtures of the group, before its destructor
+        self.__fixtures_errors(self._runner.fixtures.close())
         self.__post(*args)
         self.test.destructor()
 
     async def __aenter__(self):
+        self.__token = set_group(self._runner)
         await run_fun(self.test.constructor())
         self.__pre()
         await self.run_async()
         return self
 
     async def __aexit__(self, *args):
+        self.__fixtures_errors(await self._runner.fixtures.close_async())
         self.__post(*args)
         await run_fun(self.test.destructor())
 
+    def __fixtures_errors(self, errors: List[Exception]):
+        reset_group(self.__token)
+        if errors:
+            self._runner.add_error(CoException(errors, 'fixtures'))
+
+    @property
+    def _is_parallel(self) -> bool:
+        # only children of the root group
+        return (self._options.workers > 1 and self._runner.parent is None
+                and can_fork() and len(self._runners_list) > 1)
+
     def run(self):
+        if self._is_parallel:
+            return self.run_parallel()
         for runner in self._runners:
-            with self.ctx():
-                runner.run()
+            with self.ctx(runner):
+                runner.run(self._options)
 
     async def run_async(self):
+        if self._is_parallel:
+            return await self.run_parallel_async()
+        if self._options.concurrency > 1:
+            return await self.run_concurrent()
         for runner in self._runners:
-            with self.ctx():
-                await run_fun(runner.run())
+            with self.ctx(runner):
+                await run_fun(runner.run(self._options))
+
+    async def run_concurrent(self):
+        import asyncio
+        semaphore = asyncio.Semaphore(self._options.concurrency)
+
+        async def run_child_task(runner: 'AbstractRunner') -> 'ChildResult':
+            async with semaphore:
+                # context of the task
+                with capture() as buf:
+                    try:
+                        await run_fun(runner.run(self._options))
+                    except CoException as e:
+                        return buf.getvalue(), e, None
+                return buf.getvalue(), None, None
+
+        runners = self._runners_list
+        tasks = [asyncio.ensure_future(run_child_task(runner)) for runner in runners]
+        # output in declaration order
+        for runner, task in zip(runners, tasks):
+            with self.ctx(runner), self._worker_ctx(runner):
+                self._merge(await task)
 
     @contextmanager
-    def ctx(self):
+    def _worker_ctx(self, runner: 'AbstractRunner'):
+        try:
+            yield
+        except CoException:
+            raise
+        except Exception as e:
+            # process pool errors
+            raise CoException([e], runner.test.name)
+
+    def _merge(self, result: 'ChildResult', runner: Optional['AbstractRunner'] = None):
+        """Print buffered output of the child test & raise its errors"""
+        out, error, tree = result
+        if runner and tree is not None:
+            # results of worker process
+            runner.result = tree
+        self.logger.write_raw(out)
+        self.logger.flush()
+        if error:
+            raise error
+
+    def run_parallel(self):
+        runners = self._runners_list
+        with fork_pool(runners, self._options) as pool:
+            futures = [pool.submit(run_child, i) for i in range(len(runners))]
+            # output in declaration order
+            for runner, future in zip(runners, futures):
+                with self.ctx(runner), self._worker_ctx(runner):
+                    self._merge(future.result(), runner)
+
+    async def run_parallel_async(self):
+        import asyncio
+        runners = self._runners_list
+        with fork_pool(runners, self._options) as pool:
+            futures = [pool.submit(run_child, i) for i in range(len(runners))]
+            for runner, future in zip(runners, futures):
+                with self.ctx(runner), self._worker_ctx(runner):
+                    self._merge(await asyncio.wrap_future(future), runner)
+
+    @contextmanager
+    def ctx(self, runner: 'AbstractRunner'):
         try:
             yield
         except CoException as e_:
             self._runner.add_error(e_)
+            # not recorded by the child group itself (e.g. in worker process)
+            if not runner.result.errors:
+                runner.result.add_errors(e_)
+        # may be replaced by results of worker process
+        result = runner.result
+        self._runner.result.children.append(result)
+        if self._options.profile:
+            self._add_profiles(runner)
+        if isinstance(result, CaseResult):
+            for exporter in self._runner.root.exporters:
+                exporter.add(runner.path, result)
 
     def __pre(self):
         self.logger.writeln('')
@@ -83,35 +218,142 @@ class GroupTestCTX:
     def __post(self, *exc):
         # exc: Tuple[type, value, traceback]
         self.__finish = perf_counter() - self.__start
+        self._runner.result.time = self.__finish
         self._final_print()
 
         if any(exc):
             self._runner.add_error(exc[1])
         self._runner.raise_errors()
 
+    def _add_profiles(self, runner: 'AbstractRunner'):
+        if isinstance(runner, GroupRunner):
+            self._runner.profiles.extend(runner.profiles)
+        elif isinstance(runner, CaseRunner) and runner.result.ok:
+            # also written in worker processes
+            file = runner.profile_file(self._options)
+            if os.path.exists(file):
+                self._runner.profiles.append(file)
+
+    def _print_profile(self):
+        files = self._runner.profiles
+        if files and self._options.profile_top:
+            logger = self._runner.logger.child
+            logger.writeln(f'profile of {len(files)} case(s) in {self._options.profile}; top by own time:')
+            print_test_results(
+                top_functions(files, self._options.profile_top),
+                headers=('own', 'cumulative', 'calls'),
+                units=('sec', 'sec', 'count'),
+                logger=logger,
+            )
+
     def _final_print(self):
+        self._print_profile()
         self.logger.writeln(f'⌎-- Full time: {format_sec_metrix(self.__finish)}')
 
 
 class GroupBenchCTX(GroupTestCTX):
     _GREETINGS = 'CoBench'
     _HEADERS: Tuple[str] = ('full', 'max', 'min', 'avg')
+    _UNITS: Optional[Tuple[str, ...]] = None
+    _LOAD_HEADERS = ('avg', 'median', 'p90', 'p99', 'max', 'ops/s', 'calls')
+    _LOAD_UNITS = ('sec',) * 5 + ('count',) * 2
+    _THREADS_HEADERS = ('avg', 'median', 'p99', 'max', 'ops/s', 'calls', 'eff %')
+    _THREADS_UNITS = ('sec',) * 4 + ('count',) * 2 + ('percent',)
+
+    _options: 'BenchOptions'
 
-    def __init__(self, cls: 'GroupRunner', iterations: int):
-        super().__init__(cls)
+    def __init__(self, cls: 'GroupRunner', options: 'BenchOptions'):
+        super().__init__(cls, options)
         self._exp = []
-        self.__iterations = iterations
+        # baseline key -> (name, avg time per call, tests names)
+        self._baselines: Dict[Hashable, Tuple[str, float, List[str]]] = {}
+        # extra columns: (header, unit, value from case runner)
+        self._columns: List[Tuple[str, str, Callable[['CaseRunner'], float]]] = []
+        if options.warmup:
+            # not measured for coroutine objects: single call
+            self._columns.append(('cold', 'sec', lambda r: .0 if r.cold is None else r.cold))
+        if options.isolate:
+            self._columns.append(('in-proc sd', 'sec', lambda r: r.spread[0]))
+            self._columns.append(('x-proc sd', 'sec', lambda r: r.spread[1]))
+        if options.cpu:
+            self._columns.append(('cpu', 'sec', lambda r: r.cpu[0]))
+            self._columns.append(('thread', 'sec', lambda r: r.cpu[1]))
+            self._columns.append(('cpu %', 'percent', lambda r: r.cpu[2]))
+        if options.gc:
+            for i in range(3):
+                self._columns.append((f'gc{i}', 'count', lambda r, i=i: r.gc[i]))
+            self._columns.append(('gc pause', 'sec', lambda r: r.gc[3]))
+        if options.memory:
+            # not measured for coroutine objects
+            self._columns.append(('peak', 'bytes', lambda r: r.memory.peak if r.memory else 0))
+            self._columns.append(('retained', 'bytes', lambda r: r.memory.retained if r.memory else 0))
+            self._columns.append(('blocks', 'count', lambda r: r.memory.blocks if r.memory else 0))
+        self.__headers = (*self._HEADERS, *(c[0] for c in self._columns))
+        self.__units = (*(self._UNITS or ('sec',) * len(self._HEADERS)), *(c[1] for c in self._columns))
+        self._warnings: List[str] = []
+        self._load = []
+        self._threads = []
+        # function -> (size, avg time), with sweep
+        self._sweeps: Dict[str, List[Tuple[int, float]]] = {}
+        # function -> best fit
+        self._fits: Dict[str, 'Fit'] = {}
 
     def _final_print(self):
+        logger = self._runner.logger.child
         print_test_results(
             self._exp,
-            headers=self._HEADERS,
-            logger=self._runner.logger.child
+            headers=self.__headers,
+            units=self.__units,
+            logger=logger,
         )
+        if self._load:
+            print_test_results(
+                self._load,
+                headers=self._LOAD_HEADERS,
+                units=self._LOAD_UNITS,
+                logger=logger,
+            )
+        if self._threads:
+            print_test_results(
+                self._threads,
+                headers=self._THREADS_HEADERS,
+                units=self._THREADS_UNITS,
+                logger=logger,
+            )
+        self._fit_sweeps()
+        for note in self._notes():
+            logger.writeln(note)
+        self._runner.result.baselines = [
+            {'name': name, 'time': avg, 'tests': tests}
+            for name, avg, tests in self._baselines.values()
+        ]
+        self._runner.result.complexity = {
+            name: {'fit': f.name, 'a': f.a, 'b': f.b}
+            for name, f in self._fits.items()
+        }
         super()._final_print()
 
+    def _fit_sweeps(self):
+        for name, points in self._sweeps.items():
+            if len(points) >= MIN_SIZES:
+                fits = fit_complexity(*zip(*points))
+                if fits:
+                    self._fits[name] = fits[0]
+
+    def _notes(self) -> List[str]:
+        """Lines under the results table"""
+        return [
+            f'baseline {name} [{", ".join(tests)}]: {format_sec_metrix(avg)}'
+            + (' (subtracted)' if self._options.subtract_baseline else '')
+            for name, avg, tests in self._baselines.values()
+        ] + [
+            f'sweep {name}: {f.name} ~ {format_sec_metrix(f.a)}'
+            + (f' + {format_sec_metrix(f.b)} * {f.term}' if f.term else '')
+            for name, f in self._fits.items()
+        ] + [f'! {w}' for w in self._warnings]
+
     @staticmethod
-    def _calc(benches):
+    def _calc(benches: Sequence[float]) -> Tuple:
         s = sum(benches)
         mx, mn, avg = (
             max(benches),
@@ -120,22 +362,149 @@ class GroupBenchCTX(GroupTestCTX):
         )
         return s, mx, mn, avg
 
-    def add_exp(self, test_name: str, benches: List[float]):
+    def add_exp(self, runner: 'AbstractRunner', benches: Sequence[float], baseline: Optional[float] = None):
         # assert len(benches) == self.__iterations
         if benches:
-            self._exp.append((test_name, *self._calc(benches)))
+            if baseline is not None:
+                benches = array('d', (max(b - baseline, .0) for b in benches))
+            test_name = runner.test.name
+            row = (
+                *self._row(test_name, benches),
+                *(c[2](runner) for c in self._columns),
+            )
+            self._exp.append((test_name, *row))
+            result = runner.result
+            result.samples = benches
+            result.stats = dict(zip(self.__headers, row))
+            result.units = dict(zip(self.__headers, self.__units))
+            if runner.test.size is not None:
+                self._sweeps.setdefault(runner.test.base_name, []).append(
+                    (runner.test.size, sum(benches) / len(benches))
+                )
+
+    def _row(self, test_name: str, benches: Sequence[float]) -> Tuple:
+        return self._calc(benches)
+
+    def _null_runner(self, runner: 'AbstractRunner') -> Optional['AbstractRunner']:
+        """Runner for the baseline of the test, if it is not measured yet"""
+        key = runner.test.baseline_key
+        if self._options.baseline and key is not None and key not in self._baselines:
+            return runner.test.null_case().get_runner(self._runner)
+
+    def _add_baseline(self, runner: 'AbstractRunner', null: 'AbstractRunner', benches: Sequence[float]):
+        self._baselines[runner.test.baseline_key] = (null.test.name, sum(benches) / len(benches), [])
+
+    def _get_baseline(self, runner: 'AbstractRunner') -> Optional[float]:
+        key = runner.test.baseline_key
+        if key in self._baselines:
+            _, avg, tests = self._baselines[key]
+            tests.append(runner.test.name)
+            if self._options.subtract_baseline:
+                return avg
+
+    def _is_isolated(self, runner: 'AbstractRunner') -> bool:
+        return bool(self._options.isolate) and isinstance(runner, CaseRunner)
+
+    def _merge_bench(self, result: 'ChildBenchResult') -> 'BenchPart':
+        out, samples, state, error = result
+        self._merge((out, error, None))
+        return samples, state
+
+    def _join_processes(self, runner: 'CaseRunner', results: List['BenchPart']):
+        """Samples of all processes; set spread, mean cold & CPU times, memory to runner"""
+        parts = [r[0] for r in results]
+        states = [r[1] for r in results]
+        runner.spread = process_spread(parts)
+        if runner.spread[1] > runner.spread[0]:
+            self._warnings.append(f'{runner.test.name}: spread between processes is bigger than inside')
+        if states[0]['cold'] is not None:
+            runner.cold = sum(s['cold'] for s in states) / len(states)
+        if states[0]['cpu'] is not None:
+            runner.cpu = tuple(sum(x) / len(states) for x in zip(*(s['cpu'] for s in states)))
+        runner.memory = states[-1]['memory']
+        if states[0]['gc'] is not None:
+            # totals, like `full`
+            runner.gc = tuple(sum(x) for x in zip(*(s['gc'] for s in states)))
+        return array('d', chain.from_iterable(parts))
+
+    def _bench(self, runner: 'AbstractRunner') -> Optional[Sequence[float]]:
+        if not self._is_isolated(runner):
+            return runner.bench(self._options)
+        if not can_fork():
+            return self._join_processes(runner, [(runner.bench(self._options), runner.state)])
+
+        results = []
+        for _ in range(self._options.isolate):
+            # fresh process for each run
+            with fork_pool([runner], self._options) as pool, self._worker_ctx(runner):
+                results.append(self._merge_bench(pool.submit(bench_child, 0).result()))
+        return self._join_processes(runner, results)
+
+    async def _bench_async(self, runner: 'AbstractRunner') -> Optional[Sequence[float]]:
+        if not self._is_isolated(runner):
+            return await run_fun(runner.bench(self._options))
+        if not can_fork():
+            return self._join_processes(runner, [(await runner.bench(self._options), runner.state)])
+
+        import asyncio
+        results = []
+        for _ in range(self._options.isolate):
+            with fork_pool([runner], self._options) as pool, self._worker_ctx(runner):
+                results.append(self._merge_bench(
+                    await asyncio.wrap_future(pool.submit(bench_child, 0))
+                ))
+        return self._join_processes(runner, results)
+
+    def _is_loaded(self, runner: 'AbstractRunner') -> bool:
+        return bool(self._options.load) and isinstance(runner, CaseRunner) and runner.test.can_load
+
+    def add_load(self, runner: 'CaseRunner', levels: List[Tuple[int, float, Sequence[float]]]):
+        for concurrency, elapsed, latencies in levels:
+            if latencies:
+                st = Stats(latencies)
+                row = (st.mean, st.median, st.p90, st.p99, st.max, st.n / elapsed, st.n)
+                self._load.append((f'{runner.test.name} x{concurrency}', *row))
+                runner.result.load.append({'concurrency': concurrency, **dict(zip(self._LOAD_HEADERS, row))})
+
+    def _is_threaded(self, runner: 'AbstractRunner') -> bool:
+        return bool(self._options.threads) and isinstance(runner, CaseRunner) and runner.test.can_thread
+
+    def add_threads(self, runner: 'CaseRunner', levels: List[Tuple[int, float, Sequence[float]]]):
+        # efficiency: throughput per thread compared to the first level
+        ref = None
+        for threads, elapsed, latencies in levels:
+            if latencies:
+                st = Stats(latencies)
+                ops = st.n / elapsed
+                if ref is None:
+                    ref = ops / threads
+                row = (st.mean, st.median, st.p99, st.max, ops, st.n, ops / threads / ref * 100)
+                self._threads.append((f'{runner.test.name} t{threads}', *row))
+                runner.result.threads.append({'threads': threads, **dict(zip(self._THREADS_HEADERS, row))})
 
     def run(self):
         for runner in self._runners:
-            with self.ctx():
-                s = runner.bench(self.__iterations)
-                self.add_exp(runner.test.name, s)
+            with self.ctx(runner):
+                null = self._null_runner(runner)
+                if null:
+                    self._add_baseline(runner, null, self._bench(null))
+                s = self._bench(runner)
+                self.add_exp(runner, s, self._get_baseline(runner))
+                if self._is_threaded(runner):
+                    self.add_threads(runner, runner.threads(self._options))
 
     async def run_async(self):
         for runner in self._runners:
-            with self.ctx():
-                s = await run_fun(runner.bench(self.__iterations))
-                self.add_exp(runner.test.name, s)
+            with self.ctx(runner):
+                null = self._null_runner(runner)
+                if null:
+                    self._add_baseline(runner, null, await self._bench_async(null))
+                s = await self._bench_async(runner)
+                self.add_exp(runner, s, self._get_baseline(runner))
+                if self._is_loaded(runner):
+                    self.add_load(runner, await runner.load(self._options))
+                if self._is_threaded(runner):
+                    self.add_threads(runner, runner.threads(self._options))
 
 
 class GroupSingleBenchCTX(GroupBenchCTX):
@@ -145,12 +514,27 @@ class GroupSingleBenchCTX(GroupBenchCTX):
     def _calc(bench): return bench
 
 
+class GroupStatsBenchCTX(GroupBenchCTX):
+    _HEADERS = Stats.HEADERS
+    _UNITS = Stats.UNITS
+
+    def _row(self, test_name: str, benches: Sequence[float]) -> Tuple:
+        stats = Stats(benches)
+        self._warnings.extend(f'{test_name}: {w}' for w in stats.warnings)
+        return stats.row
+
+
 class GroupRunner(AbstractRunner):
     test: 'AbstractTestGroup'
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.__errors: List[Exception] = []
+        self.result = GroupResult(self.test.name)
+        # fixtures of the group scope; also module & session scopes
+        self.fixtures = FixtureStore()
+        # cProfile stats files of all cases, with profile
+        self.profiles: List[str] = []
         if self.test.init_errors:
             self.__errors.append(InitGroupErrors(self.test.init_errors))
 
@@ -159,30 +543,38 @@ class GroupRunner(AbstractRunner):
 
     def raise_errors(self):
         if self.__errors:
-            raise CoException(self.__errors, self.test.name)
+            e = CoException(self.__errors, self.test.name)
+            self.result.add_errors(e)
+            raise e
 
-    def run(self):
+    def run(self, options: 'TestOptions'):
         if self.test.is_async:
-            return self.__run_async()
+            return self.__run_async(options)
 
-        with GroupTestCTX(self):
+        with GroupTestCTX(self, options):
             ...
 
-    async def __run_async(self):
-        async with GroupTestCTX(self):
+    async def __run_async(self, options: 'TestOptions'):
+        async with GroupTestCTX(self, options):
             ...
 
-    def bench(self, iterations: int):
+    @staticmethod
+    def _get_bench_ctx(options: 'BenchOptions') -> Type[GroupBenchCTX]:
+        if options.iterations == 1:
+            return GroupSingleBenchCTX
+        if options.stats:
+            return GroupStatsBenchCTX
+        return GroupBenchCTX
+
+    def bench(self, options: 'BenchOptions'):
         if self.test.is_async:
-            return self.__bench_async(iterations)
+            return self.__bench_async(options)
 
-        ctx: Type[GroupBenchCTX] = GroupSingleBenchCTX if iterations == 1 else GroupBenchCTX
-        with ctx(self, iterations):
+        with self._get_bench_ctx(options)(self, options):
             ...
 
-    async def __bench_async(self, iterations: int):
-        ctx: Type[GroupBenchCTX] = GroupSingleBenchCTX if iterations == 1 else GroupBenchCTX
-        async with ctx(self, iterations):
+    async def __bench_async(self, options: 'BenchOptions'):
+        async with self._get_bench_ctx(options)(self, options):
             ...
 
 
@@ -194,12 +586,14 @@ class GoDec:
         return self
 
     def __exit__(self, *exc):
+        self.__runner.close_exporters()
+        self.__runner.save_timings()
         if exc[1] and isinstance(exc[1], CoException):
             logger_ = self.__runner.logger.child
             logger_.writeln('ERRORS:')
             for ep, e in exc[1].errors:
                 logger_.writeln('* ' + ' / '.join(ep))
-                logger_.writeln(f'  {type(e).__name__} : {e}')
+                logger_.writeln(f'  {error_type_name(e)} : {e}')
 
             self.__runner.logger.writeln('⌎' + '-' * 28)
             return True
@@ -209,6 +603,21 @@ class RootGroupRunner(GroupRunner):
     def __init__(self, test: 'AbstractTestCase'):
         super().__init__(test, None)
         self.deci: Callable[[Callable], Callable] = self.__do_async if self.is_async else self.__do
+        # streaming export of bench results
+        self.exporters: List['Exporter'] = []
+        # durations & outcomes of the last run, with timings
+        self.timings: Optional['Timings'] = None
+
+    def close_exporters(self):
+        for exporter in self.exporters:
+            exporter.close(self.result)
+        self.exporters = []
+
+    def save_timings(self):
+        if self.timings:
+            self.timings.update(self.result)
+            self.timings.save()
+            self.timings = None
 
     @property
     def logger(self): return logger
@@ -216,17 +625,36 @@ class RootGroupRunner(GroupRunner):
     def __do(self, fun):
         def wr(*args, **kwargs):
             with GoDec(self): fun(*args, **kwargs)
+            return self.result
         return wr
 
     def __do_async(self, fun):
         async def cor(coro: Coroutine):
             with GoDec(self): await coro
+            return self.result
         def wr(*args, **kwargs):
             return try_to_run(cor(fun(*args, **kwargs)))
         return wr
 
-    def run(self):
-        return self.deci(super().run)()
-
-    def bench(self, iterations: int):
-        return self.deci(super().bench)(iterations)
+    def run(self, options: 'TestOptions'):
+        if options.timings:
+            from .utils.timings import Timings
+            self.timings = Timings(options.timings)
+        return self.deci(super().run)(options)
+
+    def bench(self, options: 'BenchOptions'):
+        exporters = []
+        # files opened before an error are closed
+        with ExitStack() as stack:
+            # file formats are needed only with export
+            if options.export:
+                from .utils.export import get_exporter
+                for path in options.export:
+                    exporters.append(get_exporter(path))
+                    stack.callback(exporters[-1].abort)
+            if options.history:
+                from .utils.history import HistoryExporter
+                exporters.append(HistoryExporter(options.history, options.tag))
+            stack.pop_all()
+        self.exporters = exporters
+        return self.deci(super().bench)(options)
@@ -4,12 +4,13 @@ from .abstract import AbstractRunner
 
 if TYPE_CHECKING:
     from ..unit_case import UnitTestCase
+    from ..utils.options import TestOptions
 
 
 class UnitCaseRunner(AbstractRunner):
     test: 'UnitTestCase'
 
-    def run(self):
+    def run(self, options: 'TestOptions'):
         start_line = '-' * 14
         block_header = f'{start_line} UnitTest {self.test.name} {start_line}'
 
@@ -0,0 +1,143 @@
+import ast
+import hashlib
+import json
+import os
+import sys
+import sysconfig
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+from .result import GroupResult
+
+CACHE_VERSION = 1
+# file path, name of its groups (relative path), hash of sources, count of its groups in the run
+CachedFile = Tuple[str, str, str, int]
+
+
+def local_roots(dir_path: str) -> List[str]:
+    """Directories of local modules: tests directory & `sys.path` without stdlib & site-packages"""
+    paths = sysconfig.get_paths()
+    skip = {os.path.abspath(paths[k]) for k in ('stdlib', 'platstdlib', 'purelib', 'platlib') if k in paths}
+    roots = [os.path.abspath(dir_path)]
+    for p in sys.path:
+        p = os.path.abspath(p or os.getcwd())
+        if (os.path.isdir(p) and p not in roots
+                and not any(p == s or p.startswith(s + os.sep) for s in skip)):
+            roots.append(p)
+    return roots
+
+
+def _module_files(parts: Sequence[str], root: str) -> List[str]:
+    """Files of the module & its packages; the rest of the name may be attributes"""
+    files = []
+    d = root
+    for part in parts:
+        path = os.path.join(d, part)
+        if os.path.isdir(path):
+            init = os.path.join(path, '__init__.py')
+            if os.path.isfile(init):
+                files.append(init)
+            d = path
+        elif os.path.isfile(path + '.py'):
+            files.append(path + '.py')
+            break
+        else:
+            break
+    return files
+
+
+def _imports(file: str, roots: Sequence[str]) -> Iterator[str]:
+    """Local files imported by the file, found without import"""
+    with open(file, 'rb') as f:
+        try:
+            tree = ast.parse(f.read(), file)
+        except SyntaxError:
+            return
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names = [(a.name.split('.'), roots) for a in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module.split('.') if node.module else []
+            if node.level:
+                base = os.path.dirname(file)
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+                bases = [base]
+            else:
+                bases = roots
+            names = [([*module, a.name], bases) for a in node.names]
+        else:
+            continue
+        for parts, bases in names:
+            for root in bases:
+                files = _module_files(parts, root)
+                if files:
+                    yield from files
+                    break
+
+
+def sources_hash(file: str, roots: Sequence[str]) -> str:
+    """Hash of the file & local modules imported by it, recursively"""
+    seen = {os.path.abspath(file)}
+    queue = [*seen]
+    while queue:
+        for dep in _imports(queue.pop(), roots):
+            dep = os.path.abspath(dep)
+            if dep not in seen:
+                seen.add(dep)
+                queue.append(dep)
+    h = hashlib.sha256()
+    for path in sorted(seen):
+        h.update(path.encode())
+        with open(path, 'rb') as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()
+
+
+class ModuleCache:
+    """Hash of sources, outcome & durations of each test file of the last run"""
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.files = data['files']
+
+    def is_fresh(self, file: str, hash_: str) -> bool:
+        """Same sources & all tests were ok"""
+        entry = self.files.get(os.path.abspath(file))
+        return bool(entry) and entry['hash'] == hash_ and entry['ok']
+
+    def update(self, files: Sequence[CachedFile], result: GroupResult):
+        """Files with their groups: children of the root result by name, in any order"""
+        groups: Dict[str, List[GroupResult]] = {}
+        for r in result.children:
+            groups.setdefault(r.name, []).append(r)
+        for file, name, hash_, count in files:
+            results = groups.get(name, [])
+            if len(results) < count:
+                # not run: the run is stopped
+                continue
+            tests = {}
+            for r in results:
+                for path, case in r.cases():
+                    tests[' / '.join((*path[1:], case.name))] = {'ok': case.ok, 'time': case.time}
+            self.files[os.path.abspath(file)] = {
+                'hash': hash_,
+                'ok': all(r.ok for r in results),
+                'time': sum(r.time or .0 for r in results),
+                'tests': tests,
+            }
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.files}, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+__all__ = ('ModuleCache', 'CachedFile', 'local_roots', 'sources_hash')
@@ -0,0 +1,78 @@
+from math import log
+from typing import Callable, List, Sequence, Tuple
+
+
+def _log(n: float) -> float:
+    # empty input (size 0) is a usual sweep point
+    return log(max(n, 1))
+
+
+# class name, term of `n`
+MODELS: Tuple[Tuple[str, str, Callable[[float], float]], ...] = (
+    ('O(1)', '', lambda n: .0),
+    ('O(log n)', 'log n', _log),
+    ('O(n)', 'n', lambda n: n),
+    ('O(n log n)', 'n log n', lambda n: n * _log(n)),
+    ('O(n^2)', 'n^2', lambda n: n * n),
+)
+# fewer points cannot tell classes apart
+MIN_SIZES = 3
+# less growth over sizes range is noise
+MIN_GROWTH = .2
+
+
+_TERMS = {name: g for name, _, g in MODELS}
+
+
+class Fit:
+    """t(n) = a + b * term(n); least squares with relative errors"""
+    def __init__(self, name: str, term: str, a: float, b: float, rss: float, k: int):
+        self.name = name
+        self.term = term
+        self.a = a
+        self.b = b
+        self.rss = rss
+        # parameters count
+        self.k = k
+
+    def score(self, m: int) -> float:
+        # BIC: O(1) wins, if other classes do not fit much better
+        return m * log(max(self.rss / m, 1e-12)) + self.k * log(m)
+
+
+def _fit(sizes: Sequence[float], times: Sequence[float], name: str, term: str, g: Callable) -> Fit:
+    # weights: relative errors, so small sizes count as much as big ones
+    w = [1 / max(t, 1e-15) ** 2 for t in times]
+    xs = [g(n) for n in sizes]
+    s, sy = sum(w), sum(wi * t for wi, t in zip(w, times))
+    if not term:
+        a, b = sy / s, .0
+    else:
+        sx = sum(wi * x for wi, x in zip(w, xs))
+        sxx = sum(wi * x * x for wi, x in zip(w, xs))
+        sxy = sum(wi * x * t for wi, x, t in zip(w, xs, times))
+        det = s * sxx - sx * sx
+        b = (s * sxy - sx * sy) / det if det else .0
+        a = (sy - b * sx) / s
+        if a < 0:
+            # no negative overhead
+            a, b = .0, sxy / sxx if sxx else .0
+    rss = sum(wi * (t - a - b * x) ** 2 for wi, x, t in zip(w, xs, times))
+    return Fit(name, term, a, b, rss, 2 if term else 1)
+
+
+def fit_complexity(sizes: Sequence[float], times: Sequence[float]) -> List[Fit]:
+    """
+    Fits of complexity classes, the best first; classes with decreasing or too small growth are skipped
+    """
+    assert len(sizes) == len(times) >= MIN_SIZES, 'Not enough sizes'
+    lo, hi = min(sizes), max(sizes)
+    fits = [
+        f for f in (_fit(sizes, times, *m) for m in MODELS)
+        if not f.term or f.b * (_TERMS[f.name](hi) - _TERMS[f.name](lo)) >= MIN_GROWTH * min(times)
+    ]
+    m = len(sizes)
+    return sorted(fits, key=lambda f: f.score(m))
+
+
+__all__ = ('Fit', 'fit_complexity', 'MIN_SIZES')
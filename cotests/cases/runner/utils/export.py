@@ -0,0 +1,150 @@
+import csv
+import json
+import os
+from typing import List, Optional, Sequence, Tuple
+
+from .memory import format_bytes
+from .printer import format_sec_metrix
+from .result import CaseResult, GroupResult
+
+
+def _group(path: Tuple[str, ...]) -> str:
+    # root group is usually unnamed
+    return ' / '.join(p for p in path if p)
+
+
+class Exporter:
+    """Writes results to the file; streaming exporters write each case on finish"""
+    def __init__(self, path: str):
+        self.path = path
+
+    def add(self, path: Tuple[str, ...], case: CaseResult):
+        ...
+
+    def close(self, result: GroupResult):
+        ...
+
+    def abort(self):
+        """The run is not started: nothing is written"""
+
+
+class _FileExporter(Exporter):
+    # file is opened before the run: each case is written on finish
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._file = open(path, 'w', newline='', encoding='utf-8')
+
+    def close(self, result: GroupResult):
+        self._file.close()
+
+    def abort(self):
+        self._file.close()
+
+
+class JsonExporter(_FileExporter):
+    # not streamed: whole tree at the end; `.jsonl` - on each finished case
+    def close(self, result: GroupResult):
+        json.dump(result.to_dict(), self._file, indent=2)
+        super().close(result)
+
+
+class JsonLinesExporter(_FileExporter):
+    def add(self, path: Tuple[str, ...], case: CaseResult):
+        self._file.write(json.dumps({'group': list(path), **case.to_dict()}) + '\n')
+        self._file.flush()
+
+
+class _TableExporter(_FileExporter):
+    # header is known from the first case with stats
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._headers: Optional[Sequence[str]] = None
+        self._units: Sequence[str] = ()
+        self._wait: List[Tuple[Tuple[str, ...], CaseResult]] = []
+
+    def add(self, path: Tuple[str, ...], case: CaseResult):
+        if self._headers is None:
+            if not case.stats:
+                self._wait.append((path, case))
+                return
+            self._start(case)
+        self._row(path, case)
+        self._file.flush()
+
+    def close(self, result: GroupResult):
+        if self._wait:
+            self._start(None)
+        super().close(result)
+
+    def _start(self, case: Optional[CaseResult]):
+        self._headers = tuple(case.stats) if case else ()
+        self._units = tuple(case.units.get(h, 'sec') for h in self._headers) if case else ()
+        self._header()
+        for w in self._wait:
+            self._row(*w)
+        self._wait.clear()
+
+    @staticmethod
+    def _error(case: CaseResult) -> str:
+        return '; '.join(f'{t}: {m}' for _, t, m in case.errors)
+
+    def _header(self): raise NotImplementedError
+    def _row(self, path: Tuple[str, ...], case: CaseResult): raise NotImplementedError
+
+
+class CsvExporter(_TableExporter):
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._writer = csv.writer(self._file)
+
+    def _header(self):
+        self._writer.writerow(('group', 'case', *self._headers, 'error'))
+
+    def _row(self, path: Tuple[str, ...], case: CaseResult):
+        self._writer.writerow((
+            _group(path), case.name,
+            *(case.stats.get(h, '') for h in self._headers),
+            self._error(case),
+        ))
+
+
+class MarkdownExporter(_TableExporter):
+    def _header(self):
+        headers = ('group', 'case', *self._headers, 'error')
+        self._file.write('| ' + ' | '.join(headers) + ' |\n')
+        self._file.write('|' + '|'.join('---' for _ in headers) + '|\n')
+
+    @staticmethod
+    def _format(val: float, unit: str) -> str:
+        if unit == 'count':
+            return str(int(val))
+        if unit == 'percent':
+            return f'{val:.1f}'
+        if unit == 'bytes':
+            return format_bytes(val)
+        return format_sec_metrix(val)
+
+    def _row(self, path: Tuple[str, ...], case: CaseResult):
+        cells = (
+            _group(path), case.name,
+            *(self._format(case.stats[h], u) if h in case.stats else '' for h, u in zip(self._headers, self._units)),
+            self._error(case),
+        )
+        self._file.write('| ' + ' | '.join(c.replace('|', '\\|') for c in cells) + ' |\n')
+
+
+EXPORTERS = {
+    '.json': JsonExporter,
+    '.jsonl': JsonLinesExporter,
+    '.csv': CsvExporter,
+    '.md': MarkdownExporter,
+}
+
+
+def get_exporter(path: str) -> Exporter:
+    ext = os.path.splitext(path)[1].lower()
+    assert ext in EXPORTERS, f'Unknown export format: {path}'
+    return EXPORTERS[ext](path)
+
+
+__all__ = ('Exporter', 'get_exporter')
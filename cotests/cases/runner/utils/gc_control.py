@@ -0,0 +1,51 @@
+import gc
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Iterator, List, Optional, Tuple
+
+
+class GcMonitor:
+    """Collections per generation & pause time, from `gc.callbacks`"""
+    def __init__(self):
+        self.collections: List[int] = [0] * 3
+        self.pause = .0
+        self.__start: Optional[float] = None
+
+    def callback(self, phase: str, info: dict):
+        if phase == 'start':
+            self.__start = perf_counter()
+        elif self.__start is not None:
+            self.pause += perf_counter() - self.__start
+            self.collections[info['generation']] += 1
+            self.__start = None
+
+    @property
+    def row(self) -> Tuple[int, int, int, float]:
+        return (*self.collections, self.pause)
+
+
+@contextmanager
+def gc_mode(mode: str) -> Iterator[GcMonitor]:
+    """
+    :param mode: `default` - only count; `disable` - no automatic collections;
+                 `freeze` - collect & move all objects to permanent generation
+    """
+    monitor = GcMonitor()
+    enabled = gc.isenabled()
+    if mode == 'disable':
+        gc.disable()
+    elif mode == 'freeze':
+        gc.collect()
+        gc.freeze()
+    gc.callbacks.append(monitor.callback)
+    try:
+        yield monitor
+    finally:
+        gc.callbacks.remove(monitor.callback)
+        if mode == 'freeze':
+            gc.unfreeze()
+        if enabled:
+            gc.enable()
+
+
+__all__ = ('GcMonitor', 'gc_mode')
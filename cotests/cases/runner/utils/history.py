@@ -0,0 +1,121 @@
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from .export import Exporter
+from .result import GroupResult
+
+# compared stat of the case: first found in both runs
+METRICS = ('median', 'avg', 'time')
+
+# case name, baseline value, current value, change in percent
+Diff = Tuple[str, float, float, float]
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        p = subprocess.run(
+            ('git', *args),
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            universal_newlines=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return p.stdout.strip() if p.returncode == 0 else None
+
+
+def run_meta() -> Dict[str, Any]:
+    """Interpreter, CPU & commit of the run"""
+    commit = _git('rev-parse', 'HEAD')
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'commit': commit,
+        'dirty': bool(_git('status', '--porcelain', '--untracked-files=no')) if commit else None,
+    }
+
+
+def _case_key(path: Tuple[str, ...], name: str) -> str:
+    return ' / '.join((*(p for p in path if p), name))
+
+
+def make_record(result: GroupResult, tag: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        'tag': tag,
+        'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'meta': run_meta(),
+        'cases': {_case_key(path, c.name): c.stats for path, c in result.cases() if c.stats},
+        'errors': len(result.errors),
+    }
+
+
+def append_run(path: str, record: Dict[str, Any]):
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    # append-only: one run per line
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record) + '\n')
+
+
+def load_history(path: str) -> List[Dict[str, Any]]:
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_run(runs: List[Dict[str, Any]], ref: str) -> Dict[str, Any]:
+    """Run by index (`-1` - last) or last run with the tag"""
+    if ref.lstrip('-').isdigit():
+        try:
+            return runs[int(ref)]
+        except IndexError:
+            raise LookupError(f'No run {ref}; history has {len(runs)}') from None
+    for run in reversed(runs):
+        if run.get('tag') == ref:
+            return run
+    raise LookupError(f'No run with tag {ref!r}')
+
+
+def compare_runs(
+        base: Dict[str, Any],
+        run: Dict[str, Any],
+        metric: Optional[str] = None,
+) -> Tuple[List[Diff], List[str], List[str]]:
+    """
+    :return: diffs of common cases, new cases, removed cases
+    """
+    diffs = []
+    for name, stats in run['cases'].items():
+        base_stats = base['cases'].get(name)
+        if base_stats is None:
+            continue
+        key = metric or next((m for m in METRICS if m in stats and m in base_stats), None)
+        if key is None or key not in stats or key not in base_stats:
+            continue
+        b, c = base_stats[key], stats[key]
+        diffs.append((name, b, c, (c - b) / b * 100 if b else .0))
+    return (
+        diffs,
+        [n for n in run['cases'] if n not in base['cases']],
+        [n for n in base['cases'] if n not in run['cases']],
+    )
+
+
+class HistoryExporter(Exporter):
+    # whole run is appended at the end
+    def __init__(self, path: str, tag: Optional[str] = None):
+        super().__init__(path)
+        self.__tag = tag
+
+    def close(self, result: GroupResult):
+        append_run(self.path, make_record(result, self.__tag))
+
+
+__all__ = ('HistoryExporter', 'load_history', 'find_run', 'compare_runs', 'run_meta')
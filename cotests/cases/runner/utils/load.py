@@ -0,0 +1,100 @@
+import asyncio
+import contextvars
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+async def closed_loop(
+        call: Callable[[], Awaitable],
+        concurrency: int,
+        *,
+        duration: Optional[float] = None,
+        requests: Optional[int] = None,
+) -> Tuple[float, array]:
+    """
+    Keep `concurrency` calls in flight: each finished call starts the next one,
+    until `requests` calls are started or `duration` is over.
+    :return: full time, latency of each call
+    """
+    assert duration or requests, 'Duration or requests count is needed'
+    latencies = array('d')
+    started = 0
+    deadline = perf_counter() + duration if duration else None
+
+    async def worker():
+        nonlocal started
+        while True:
+            if requests:
+                if started >= requests:
+                    return
+                started += 1
+            elif perf_counter() >= deadline:
+                return
+            start = perf_counter()
+            await call()
+            latencies.append(perf_counter() - start)
+
+    start_all = perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return perf_counter() - start_all, latencies
+
+
+def thread_loop(
+        get_call: Callable[[], Callable[[], Any]],
+        threads: int,
+        *,
+        duration: Optional[float] = None,
+        requests: Optional[int] = None,
+) -> Tuple[float, array]:
+    """
+    Call the function in `threads` threads at once,
+    until `requests` calls are started or `duration` is over.
+    :param get_call: own call for each thread
+    :return: full time, latency of each call
+    """
+    assert duration or requests, 'Duration or requests count is needed'
+    latencies = [array('d') for _ in range(threads)]
+    started = 0
+    lock = threading.Lock()
+    # all threads start together
+    barrier = threading.Barrier(threads + 1)
+    deadline = .0
+
+    def worker(call: Callable[[], Any], lat: array):
+        nonlocal started
+        barrier.wait()
+        while True:
+            if requests:
+                with lock:
+                    if started >= requests:
+                        return
+                    started += 1
+            elif perf_counter() >= deadline:
+                return
+            start = perf_counter()
+            call()
+            lat.append(perf_counter() - start)
+
+    # before threads: an error does not leave them waiting on the barrier
+    calls = [get_call() for _ in range(threads)]
+    with ThreadPoolExecutor(threads) as pool:
+        # running group in each thread: fixtures of the test
+        futures = [
+            pool.submit(contextvars.copy_context().run, worker, call, lat)
+            for call, lat in zip(calls, latencies)
+        ]
+        start_all = perf_counter()
+        if duration:
+            deadline = start_all + duration
+        barrier.wait()
+        for f in futures:
+            f.result()
+        elapsed = perf_counter() - start_all
+    return elapsed, array('d', chain.from_iterable(latencies))
+
+
+__all__ = ('closed_loop', 'thread_loop')
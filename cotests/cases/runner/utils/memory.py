@@ -0,0 +1,64 @@
+import gc
+from contextlib import contextmanager
+from typing import Iterator
+
+__METRIX = (
+    (1024 ** 3, 'GiB'),
+    (1024 ** 2, 'MiB'),
+    (1024, 'KiB'),
+)
+
+
+def get_bytes_metrix(size: float):
+    for deci, metr in __METRIX:
+        if size >= deci:
+            return deci, metr
+    return 1, 'B'
+
+
+def format_bytes(size: float) -> str:
+    deci, metr = get_bytes_metrix(size)
+    if deci == 1:
+        return f'{int(size)} B'
+    return f'{size / deci:.3f} {metr}'
+
+
+class MemoryUsage:
+    def __init__(self):
+        # max traced size during the call
+        self.peak = 0
+        # size & count of blocks, allocated by the call and alive after it
+        self.retained = 0
+        self.blocks = 0
+
+    def __str__(self):
+        return f'peak {format_bytes(self.peak)}, retained {format_bytes(self.retained)} in {self.blocks} blocks'
+
+
+@contextmanager
+def trace_memory() -> Iterator[MemoryUsage]:
+    """Trace allocations inside the block from scratch"""
+    import tracemalloc
+    usage = MemoryUsage()
+    was_tracing = tracemalloc.is_tracing()
+    # restart: clears traces & peak
+    tracemalloc.stop()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        yield usage
+        usage.peak = tracemalloc.get_traced_memory()[1]
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        usage.retained = sum(t.size for t in snapshot.traces)
+        usage.blocks = len(snapshot.traces)
+    finally:
+        tracemalloc.stop()
+        if was_tracing:
+            tracemalloc.start()
+
+
+__all__ = ('MemoryUsage', 'trace_memory', 'format_bytes', 'get_bytes_metrix')
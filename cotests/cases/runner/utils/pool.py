@@ -0,0 +1,80 @@
+import sys
+from contextlib import contextmanager, redirect_stdout
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from cotests.exceptions import CoException
+from cotests.logger import capture
+from ...utils.fixture import worker_run
+
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from ..abstract import AbstractRunner
+    from ...utils.options import TestOptions
+
+# output, error & results tree of child test
+ChildResult = Tuple[str, Optional[CoException], Any]
+# output, samples, runner state & error of child benchmark
+ChildBenchResult = Tuple[str, Optional[Sequence[float]], Dict[str, Any], Optional[CoException]]
+
+# runners of parallel group; forked workers inherit it
+_RUNNERS: List['AbstractRunner'] = []
+_OPTIONS: Optional['TestOptions'] = None
+
+
+def can_fork() -> bool:
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def _init_worker():
+    # forked from a running event loop
+    if 'asyncio' in sys.modules:
+        sys.modules['asyncio'].events._set_running_loop(None)
+
+
+def run_child(i: int) -> ChildResult:
+    """Run child test in worker process with buffered output"""
+    runner = _RUNNERS[i]
+    with capture() as buf, redirect_stdout(buf):
+        try:
+            worker_run(runner.parent, lambda: runner.run(_OPTIONS))
+        except CoException as e:
+            return buf.getvalue(), e.picklable(), runner.result
+    return buf.getvalue(), None, runner.result
+
+
+def bench_child(i: int) -> ChildBenchResult:
+    """Benchmark child test in worker process with buffered output"""
+    runner = _RUNNERS[i]
+    with capture() as buf, redirect_stdout(buf):
+        try:
+            samples = worker_run(runner.parent, lambda: runner.bench(_OPTIONS))
+        except CoException as e:
+            return buf.getvalue(), None, {}, e.picklable()
+    return buf.getvalue(), samples, runner.state, None
+
+
+@contextmanager
+def fork_pool(
+        runners: List['AbstractRunner'],
+        options: 'TestOptions',
+) -> Iterator['ProcessPoolExecutor']:
+    # only parallel & isolated runs need processes
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    global _RUNNERS, _OPTIONS
+    prev = _RUNNERS, _OPTIONS
+    _RUNNERS, _OPTIONS = runners, options
+    try:
+        # idle worker takes next test from the common queue
+        with ProcessPoolExecutor(
+                min(options.workers, len(runners)),
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_worker,
+        ) as pool:
+            yield pool
+    finally:
+        _RUNNERS, _OPTIONS = prev
+
+
+__all__ = ('ChildResult', 'ChildBenchResult', 'can_fork', 'fork_pool', 'run_child', 'bench_child')
@@ -1,6 +1,8 @@
 from math import log10
 from typing import TYPE_CHECKING, Tuple, Optional, List
 
+from .memory import get_bytes_metrix
+
 if TYPE_CHECKING:
     from cotests.logger import CoLogger
 
@@ -16,6 +18,8 @@ __METRIX = (
 
 
 def get_sec_metrix(sec: float) -> Tuple[float, str]:
+    if not sec:
+        return 1, 'sec'
     for deci, metr in __METRIX:
         if sec >= deci:
             return deci, metr
@@ -28,6 +32,8 @@ def format_sec_metrix(sec: float) -> str:
 
 
 def __float_len(x: float) -> int:
+    if x < 1:
+        return 1
     return int(log10(x)) + 1
 
 
@@ -36,7 +42,12 @@ def print_test_results(
         *,
         logger: 'CoLogger',
         headers: Optional[Tuple] = None,
+        units: Optional[Tuple[str, ...]] = None,
 ) -> None:
+    """
+    :param exp: rows (name, *values); first value is used for `%`
+    :param units: unit of each value: `sec` (default), `bytes`, `count` or `percent`
+    """
     if not exp:
         return
         # return ['! No results.']
@@ -50,6 +61,10 @@ def print_test_results(
 
     if headers:
         assert len(headers) + 1 == len(first)
+    if units:
+        assert len(units) + 1 == len(first)
+    else:
+        units = ('sec',) * (len(first) - 1)
 
     for i in iter_:
         if len(i[0]) > max_fn_len:
@@ -66,15 +81,39 @@ def print_test_results(
     min_full = minmax[0][0]
 
     def get_percent(val: float) -> str:
+        if not min_full:
+            # e.g. zero time after baseline subtraction
+            return ' 999+' if val else '100.0'
         d = val / min_full
         if d < 10:
             return f'{d * 100:.1f}'
         return ' 999+'
 
-    for min_s, max_s in minmax:
-        deci, prefix = get_sec_metrix(min_s)
+    for i, (min_s, max_s) in enumerate(minmax):
+        if units[i] == 'count':
+            max_s_len = __float_len(max_s)
+            if headers and len(headers[i]) > max_s_len:
+                max_s_len = len(headers[i])
+            row_format += f'| %{max_s_len}d '
+            multi.append(1)
+            lens.append(max_s_len)
+            continue
+        if units[i] == 'percent':
+            max_s_len = max(__float_len(max_s) + 2, len(headers[i]) if headers else 0)
+            row_format += f'| %{max_s_len}.1f '
+            multi.append(1)
+            lens.append(max_s_len)
+            continue
+
+        if units[i] == 'bytes':
+            deci, prefix = get_bytes_metrix(min_s or max_s)
+        else:
+            deci, prefix = get_sec_metrix(min_s or max_s)
 
         max_s_len = __float_len(max_s / deci) + 4
+        if headers and len(headers[i]) > max_s_len + len(prefix) + 1:
+            # long header, e.g. `in-proc sd`
+            max_s_len = len(headers[i]) - len(prefix) - 1
         row_format += f'| %{max_s_len}.3f {prefix} '
         multi.append(deci)
         lens.append(max_s_len + len(prefix) + 1)
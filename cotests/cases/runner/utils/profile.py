@@ -0,0 +1,94 @@
+import os
+import re
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from types import FrameType
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+# function, total time inside, cumulative time, calls
+ProfileRow = Tuple[str, float, float, int]
+
+
+def profile_path(directory: str, path: Sequence[str], name: str, ext: str = '.pstats') -> str:
+    """Stats file of the case: groups & case names"""
+    full = '.'.join(p for p in (*path, name) if p)
+    return os.path.join(directory, re.sub(r'[^\w.-]+', '_', full) + ext)
+
+
+@contextmanager
+def profile_to(file: str) -> Iterator[None]:
+    # imported only when enabled
+    import cProfile
+    pr = cProfile.Profile()
+    pr.enable()
+    try:
+        yield
+    finally:
+        pr.disable()
+        os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+        pr.dump_stats(file)
+
+
+def top_functions(files: Sequence[str], n: int) -> List[ProfileRow]:
+    """Functions with max total time inside over all files"""
+    import pstats
+    stats = pstats.Stats(*files)
+    stats.sort_stats('tottime')
+    rows = []
+    for func in stats.fcn_list[:n]:
+        _, calls, tottime, cumtime, _ = stats.stats[func]
+        rows.append((pstats.func_std_string(func), tottime, cumtime, calls))
+    return rows
+
+
+def _collapse(frame: Optional[FrameType]) -> str:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':'))
+        frame = frame.f_back
+    return ';'.join(reversed(stack))
+
+
+class StackSampler:
+    """Samples stack of the thread from background thread; collapsed stacks for flamegraph tools"""
+    def __init__(self, interval: float, file: Optional[str] = None):
+        self.__interval = interval
+        self.__file = file
+        self.__thread_id = threading.get_ident()
+        self.__stop = threading.Event()
+        self.__thread: Optional[threading.Thread] = None
+        self.__switch = .0
+        self.counts = Counter()
+
+    def __run(self):
+        while not self.__stop.wait(self.__interval):
+            frame = sys._current_frames().get(self.__thread_id)
+            if frame is not None:
+                self.counts[_collapse(frame)] += 1
+
+    def __enter__(self):
+        # sampler gets GIL at least each interval, not only on I/O of the thread
+        self.__switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(self.__switch, self.__interval))
+        self.__thread = threading.Thread(target=self.__run, name='cotests-sampler', daemon=True)
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.__stop.set()
+        self.__thread.join()
+        sys.setswitchinterval(self.__switch)
+        if self.__file:
+            self.write(self.__file)
+
+    def write(self, file: str):
+        os.makedirs(os.path.dirname(file) or '.', exist_ok=True)
+        with open(file, 'w', encoding='utf-8') as f:
+            for stack, count in self.counts.most_common():
+                f.write(f'{stack} {count}\n')
+
+
+__all__ = ('profile_path', 'profile_to', 'top_functions', 'StackSampler')
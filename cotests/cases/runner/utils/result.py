@@ -0,0 +1,120 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from cotests.exceptions import CoException, error_type_name
+
+# path inside the test, error type, message
+ErrorInfo = Tuple[Tuple[str, ...], str, str]
+
+
+def _errors(e: Exception) -> Iterator[ErrorInfo]:
+    if isinstance(e, CoException):
+        for path, err in e.errors:
+            yield path, error_type_name(err), str(err)
+    else:
+        yield (), error_type_name(e), str(e)
+
+
+def _errors_dict(errors: List[ErrorInfo]) -> List[Dict[str, Any]]:
+    return [{'path': list(p), 'type': t, 'message': m} for p, t, m in errors]
+
+
+def _errors_from_dict(errors: List[Dict[str, Any]]) -> List[ErrorInfo]:
+    return [(tuple(e['path']), e['type'], e['message']) for e in errors]
+
+
+class CaseResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.samples: Optional[Sequence[float]] = None
+        # values of the results table: header -> value, header -> unit
+        self.stats: Dict[str, float] = {}
+        self.units: Dict[str, str] = {}
+        # rows of the load & threads tables
+        self.load: List[Dict[str, float]] = []
+        self.threads: List[Dict[str, float]] = []
+        self.errors: List[ErrorInfo] = []
+        # duration of the test run
+        self.time: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_errors(self, e: Exception):
+        self.errors.extend(_errors(e))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'time': self.time,
+            'samples': None if self.samples is None else list(self.samples),
+            'stats': self.stats,
+            'load': self.load,
+            'threads': self.threads,
+            'errors': _errors_dict(self.errors),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CaseResult':
+        res = cls(data['name'])
+        res.time = data['time']
+        res.samples = data['samples']
+        res.stats = data['stats']
+        res.load = data['load']
+        res.threads = data['threads']
+        res.errors = _errors_from_dict(data['errors'])
+        return res
+
+
+class GroupResult:
+    def __init__(self, name: str):
+        self.name = name
+        self.children: List[Union['GroupResult', CaseResult]] = []
+        # all errors of the group & its children
+        self.errors: List[ErrorInfo] = []
+        self.baselines: List[Dict[str, Any]] = []
+        # function -> best complexity fit of sweep
+        self.complexity: Dict[str, Dict[str, Any]] = {}
+        self.time: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def add_errors(self, e: Exception):
+        self.errors.extend(_errors(e))
+
+    def cases(self, path: Tuple[str, ...] = ()) -> Iterator[Tuple[Tuple[str, ...], CaseResult]]:
+        """All cases of the tree with their groups path"""
+        path = (*path, self.name)
+        for c in self.children:
+            if isinstance(c, GroupResult):
+                yield from c.cases(path)
+            else:
+                yield path, c
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'name': self.name,
+            'time': self.time,
+            'baselines': self.baselines,
+            'complexity': self.complexity,
+            'errors': _errors_dict(self.errors),
+            'children': [c.to_dict() for c in self.children],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'GroupResult':
+        res = cls(data['name'])
+        res.time = data['time']
+        res.baselines = data['baselines']
+        res.complexity = data['complexity']
+        res.errors = _errors_from_dict(data['errors'])
+        res.children = [
+            (GroupResult if 'children' in c else CaseResult).from_dict(c)
+            for c in data['children']
+        ]
+        return res
+
+
+__all__ = ('CaseResult', 'GroupResult')
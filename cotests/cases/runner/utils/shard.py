@@ -0,0 +1,106 @@
+import json
+import os
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from cotests.logger import logger
+from .printer import format_sec_metrix
+from .result import GroupResult
+
+REPORT_VERSION = 1
+# 1-based index of the shard, count of shards
+Shard = Tuple[int, int]
+
+
+def parse_shard(shard: str) -> Shard:
+    """`i/N`: shard `i` of `N`, from 1"""
+    try:
+        i, n = (int(x) for x in shard.split('/'))
+    except ValueError:
+        raise ValueError(f'Incorrect shard: {shard}, expected i/N') from None
+    if not 1 <= i <= n:
+        raise ValueError(f'Incorrect shard: {shard}, expected i/N with 1 <= i <= N')
+    return i, n
+
+
+def split(ids: Sequence[str], count: int, durations: Optional[Dict[str, float]] = None) -> List[List[str]]:
+    """
+    Ids of each shard, the same on each node.
+    With known durations - longest first to the least loaded shard (unknown ones take the mean),
+    otherwise - by stable hash of id
+    """
+    shards: List[List[str]] = [[] for _ in range(count)]
+    known = [durations[i] for i in ids if durations and i in durations]
+    if not known:
+        for i in ids:
+            shards[zlib.crc32(i.encode()) % count].append(i)
+        return shards
+
+    mean = sum(known) / len(known)
+    loads = [.0] * count
+    for i in sorted(ids, key=lambda x: (-durations.get(x, mean), x)):
+        s = min(range(count), key=lambda k: (loads[k], k))
+        shards[s].append(i)
+        loads[s] += durations.get(i, mean)
+    # declaration order inside the shard
+    pos = {x: n for n, x in enumerate(ids)}
+    return [sorted(s, key=pos.get) for s in shards]
+
+
+def write_report(path: str, shard: Shard, ids: Sequence[str], result: GroupResult):
+    """Result of the shard with ids of all shards in declaration order, to merge"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'version': REPORT_VERSION,
+            'shard': list(shard),
+            'ids': list(ids),
+            'result': result.to_dict(),
+        }, f, indent=1)
+
+
+def merge_reports(paths: Sequence[str]) -> GroupResult:
+    """Results of all shards as a single run: children in declaration order"""
+    reports: List[Dict[str, Any]] = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            report = json.load(f)
+        if report.get('version') != REPORT_VERSION:
+            raise ValueError(f'Unknown report version: {path}')
+        reports.append(report)
+    if not reports:
+        raise ValueError('No reports')
+
+    count = reports[0]['shard'][1]
+    found = sorted(r['shard'][0] for r in reports)
+    if any(r['shard'][1] != count for r in reports) or found != list(range(1, count + 1)):
+        raise ValueError(f'Expected reports of shards 1..{count}, found: {found}')
+
+    pos = {x: n for n, x in enumerate(reports[0]['ids'])}
+    results = [GroupResult.from_dict(r['result']) for r in reports]
+    merged = GroupResult(results[0].name)
+    merged.children = sorted(
+        (c for r in results for c in r.children),
+        key=lambda c: pos.get(c.name, len(pos)),
+    )
+    for r in results:
+        merged.errors.extend(r.errors)
+    merged.time = sum(r.time or .0 for r in results)
+    return merged
+
+
+def print_report(result: GroupResult, shards: int):
+    logger.writeln(f'⌌{"-" * 14} Merged {shards} shard(s) of {result.name} {"-" * 14}')
+    log = logger.child
+    for c in result.children:
+        line = f'ok - {format_sec_metrix(c.time or .0)}' if c.ok else f'error: {len(c.errors)} error(s)'
+        log.writeln(f'* {c.name}:{line}')
+    if result.errors:
+        log.writeln('ERRORS:')
+        for path, type_name, message in result.errors:
+            log.writeln('* ' + ' / '.join(path))
+            log.writeln(f'  {type_name} : {message}')
+    logger.writeln(f'⌎-- Full time: {format_sec_metrix(result.time or .0)}')
+
+
+__all__ = ('Shard', 'parse_shard', 'split', 'write_report', 'merge_reports', 'print_report')
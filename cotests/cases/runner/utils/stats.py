@@ -0,0 +1,128 @@
+from array import array
+from math import sqrt
+from typing import Iterable, List, Sequence, Tuple
+
+# scale MAD to stdev of normal distribution
+MAD_SCALE = 1.4826
+# modified z-score limit for outliers (Iglewicz & Hoaglin)
+OUTLIER_Z = 3.5
+# coefficient of variation for noisy results
+NOISY_CV = .1
+# share of outliers, when they look like a second mode
+BIMODAL_SHARE = .1
+BIMODAL_MIN_SAMPLES = 20
+
+_np = None
+
+
+def _numpy():
+    # optional; imported on first use
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np
+
+
+def _percentile(sorted_data: List[float], q: float) -> float:
+    # linear interpolation, like numpy default
+    k = (len(sorted_data) - 1) * q
+    f = int(k)
+    if f + 1 < len(sorted_data):
+        return sorted_data[f] + (sorted_data[f + 1] - sorted_data[f]) * (k - f)
+    return sorted_data[f]
+
+
+class Stats:
+    HEADERS = ('full', 'max', 'min', 'avg', 'median', 'stdev', 'mad', 'p90', 'p99', 'outl')
+    UNITS = ('sec',) * 9 + ('count',)
+
+    def __init__(self, samples: Iterable[float]):
+        self.samples = samples if isinstance(samples, array) else array('d', samples)
+        self.n = len(self.samples)
+        assert self.n, 'No samples'
+        np = _numpy()
+        if np:
+            self.__calc_numpy(np)
+        else:
+            self.__calc()
+        self.cv = self.stdev / self.mean if self.mean else .0
+
+    def __calc(self):
+        data = sorted(self.samples)
+        n = self.n
+        self.sum = sum(data)
+        self.min, self.max = data[0], data[-1]
+        self.mean = self.sum / n
+        self.median = _percentile(data, .5)
+        self.p90 = _percentile(data, .9)
+        self.p99 = _percentile(data, .99)
+
+        m2 = sum((x - self.mean) ** 2 for x in data)
+        self.stdev = sqrt(m2 / (n - 1)) if n > 1 else .0
+        self.mad = _percentile(sorted(abs(x - self.median) for x in data), .5)
+        if self.mad:
+            limit = OUTLIER_Z * MAD_SCALE * self.mad
+            self.outliers = sum(1 for x in data if abs(x - self.median) > limit)
+        else:
+            self.outliers = 0
+
+    def __calc_numpy(self, np):
+        data = np.frombuffer(self.samples, dtype=np.float64)
+        n = self.n
+        self.sum = float(data.sum())
+        self.min, self.max = float(data.min()), float(data.max())
+        self.mean = self.sum / n
+        self.median, self.p90, self.p99 = (float(x) for x in np.percentile(data, (50, 90, 99)))
+
+        m2 = float(((data - self.mean) ** 2).sum())
+        self.stdev = sqrt(m2 / (n - 1)) if n > 1 else .0
+        abs_dev = np.abs(data - self.median)
+        self.mad = float(np.median(abs_dev))
+        if self.mad:
+            self.outliers = int((abs_dev > OUTLIER_Z * MAD_SCALE * self.mad).sum())
+        else:
+            self.outliers = 0
+
+    @property
+    def row(self) -> Tuple:
+        return (
+            self.sum, self.max, self.min, self.mean,
+            self.median, self.stdev, self.mad, self.p90, self.p99, self.outliers,
+        )
+
+    @property
+    def warnings(self) -> List[str]:
+        w = []
+        if self.cv > NOISY_CV:
+            w.append(f'noisy results (cv {self.cv * 100:.1f}%)')
+        if self.n >= BIMODAL_MIN_SAMPLES and self.outliers > self.n * BIMODAL_SHARE:
+            w.append(f'maybe bimodal ({self.outliers} of {self.n} samples far from median)')
+        elif self.outliers:
+            w.append(f'{self.outliers} outlier(s)')
+        return w
+
+
+def _stdev(data: Sequence[float]) -> float:
+    n = len(data)
+    if n < 2:
+        return .0
+    mean = sum(data) / n
+    return sqrt(sum((x - mean) ** 2 for x in data) / (n - 1))
+
+
+def process_spread(parts: Sequence[Sequence[float]]) -> Tuple[float, float]:
+    """
+    Spread of samples from several processes
+    :return: mean stdev inside process, stdev of process means
+    """
+    return (
+        sum(_stdev(p) for p in parts) / len(parts),
+        _stdev([sum(p) / len(p) for p in parts]),
+    )
+
+
+__all__ = ('Stats', 'process_spread')
@@ -0,0 +1,66 @@
+import json
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from .result import CaseResult, GroupResult
+
+if TYPE_CHECKING:
+    from ..abstract import AbstractRunner
+
+TIMINGS_VERSION = 1
+
+
+def result_id(path: Tuple[str, ...]) -> str:
+    """Names of groups & test without the root group: it is named by the run"""
+    return ' / '.join(path[1:])
+
+
+def _walk(result: GroupResult, path: Tuple[str, ...]) -> Iterator[Tuple[str, Union[GroupResult, CaseResult]]]:
+    for child in result.children:
+        p = (*path, child.name)
+        yield result_id(p), child
+        if isinstance(child, GroupResult):
+            yield from _walk(child, p)
+
+
+class Timings:
+    """Duration & outcome of each test & group of the last run, to order the next runs"""
+    def __init__(self, path: str):
+        self.path = path
+        self.tests: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == TIMINGS_VERSION:
+            self.tests = data['tests']
+
+    def __key(self, runner: 'AbstractRunner', order: str) -> Tuple[int, float]:
+        entry = self.tests.get(result_id((*runner.path, runner.test.name)))
+        # new tests go first: nothing is known about them
+        if entry is None:
+            return 0, .0
+        if order == 'failed':
+            return (0 if not entry['ok'] else 1), .0
+        return 1, (-entry['time'] if order == 'slowest' else entry['time'])
+
+    def sort(self, runners: Iterable['AbstractRunner'], order: str) -> List['AbstractRunner']:
+        """Runners of the group in the order; declaration order among equal ones"""
+        return sorted(runners, key=lambda r: self.__key(r, order))
+
+    def update(self, result: GroupResult):
+        """Tests & groups of the root result; not run ones are kept"""
+        for id_, r in _walk(result, (result.name,)):
+            if r.time is not None:
+                self.tests[id_] = {'time': r.time, 'ok': r.ok}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': TIMINGS_VERSION, 'tests': self.tests}, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+__all__ = ('Timings', 'result_id')
@@ -1,16 +1,25 @@
-from typing import TYPE_CHECKING, Optional, Tuple, Sequence, Dict
+from typing import TYPE_CHECKING, Any, Optional, Tuple, Iterable, Dict
+
+from .source import Params, as_source, is_stream, map_params
 
 if TYPE_CHECKING:
     from cotests.typ import CoArgsList, TestArgs, TestKwargs
 
 
+def _split_record(record: Any) -> Tuple['TestArgs', 'TestKwargs']:
+    # record of stream: dict - kwargs, others - args
+    if isinstance(record, dict):
+        return (), record
+    return record, {}
+
+
 class CoTestArgs:
 
     def __init__(
             self,
             # personal
-            pa: Optional[Sequence['TestArgs']],
-            pkw: Optional[Sequence['TestKwargs']],
+            pa: Optional[Iterable['TestArgs']],
+            pkw: Optional[Iterable['TestKwargs']],
             # global
             ga: Optional['TestArgs'],
             gkw: Optional['TestKwargs'],
@@ -31,7 +40,10 @@ class CoTestArgs:
         else:
             merge_kw = lambda pk: pk
 
-        if pa:
+        if is_stream(pa) or is_stream(pkw):
+            # records are streamed on each iteration
+            self.__params = self.__stream(pa, pkw, ga, gkw, merge_kw)
+        elif pa:
             assert not ga, 'Personal & global args conflict'
             if pkw:
                 assert len(pa) == len(pkw), 'Personal args & kwargs have different length'
@@ -43,6 +55,24 @@ class CoTestArgs:
         else:
             self.__params = [(ga, gkw)]
 
+    @staticmethod
+    def __stream(pa, pkw, ga, gkw, merge_kw) -> 'Params':
+        def one(record):
+            a, k = _split_record(record)
+            return a or ga, merge_kw(k)
+
+        def pair(ra, rk):
+            a1, k1 = _split_record(ra)
+            a2, k2 = _split_record(rk)
+            return (*a1, *a2), merge_kw({**k1, **k2})
+
+        if pa is not None:
+            assert not ga, 'Personal & global args conflict'
+            if pkw is not None:
+                return Params(pair, as_source(pa), as_source(pkw))
+            return Params(one, as_source(pa))
+        return Params(one, as_source(pkw))
+
     def __merge_kw(self,
                    k1: 'TestKwargs',
                    k2: 'TestKwargs',
@@ -63,11 +93,11 @@ class CoTestArgs:
             if self.ha:
                 raise ValueError('args conflict')
             if kwargs:
-                return [(args, self.__merge_kw(p[1], kwargs)) for p in self.__params]
+                return map_params(self.__params, lambda p: (args, self.__merge_kw(p[1], kwargs)))
             else:
-                return [(args, p[1]) for p in self.__params]
+                return map_params(self.__params, lambda p: (args, p[1]))
         elif kwargs:
-            return [(p[0], self.__merge_kw(p[1], kwargs)) for p in self.__params]
+            return map_params(self.__params, lambda p: (p[0], self.__merge_kw(p[1], kwargs)))
         else:
             return self.__params
 
@@ -3,7 +3,10 @@ from time import perf_counter
 from typing import Optional, Callable
 
 
-def bench_decorator(func):
+def bench_decorator(func, loops: int = 1):
+    if loops > 1:
+        return bench_decorator_loop(func, loops)
+
     def wrapper(*args, **kwargs):
         bench_start = perf_counter()
         func(*args, **kwargs)
@@ -12,7 +15,23 @@ def bench_decorator(func):
     return wrapper
 
 
-def bench_decorator_async(func, *_):
+def bench_decorator_loop(func, loops: int):
+    # time of one call, measured over the whole inner loop
+    r = range(loops)
+
+    def wrapper(*args, **kwargs):
+        bench_start = perf_counter()
+        for _ in r:
+            func(*args, **kwargs)
+        return (perf_counter() - bench_start) / loops
+
+    return wrapper
+
+
+def bench_decorator_async(func, *_, loops: int = 1):
+    if loops > 1:
+        return bench_decorator_async_loop(func, loops)
+
     async def wrapper(*args, **kwargs):
         bench_start = perf_counter()
         await func(*args, **kwargs)
@@ -21,6 +40,18 @@ def bench_decorator_async(func, *_):
     return wrapper
 
 
+def bench_decorator_async_loop(func, loops: int):
+    r = range(loops)
+
+    async def wrapper(*args, **kwargs):
+        bench_start = perf_counter()
+        for _ in r:
+            await func(*args, **kwargs)
+        return (perf_counter() - bench_start) / loops
+
+    return wrapper
+
+
 class TestCaseExt:
     @staticmethod
     def __empty_function(*_, **__):
@@ -57,16 +88,16 @@ class TestCaseExt:
             elif not (inspect.isfunction(x) or inspect.ismethod(x)):
                 raise Exception(f'Bad function {x}')
 
-    def __with_prepost(self, func):
+    def __with_prepost(self, func, loops: int = 1):
         def wrapper(*args, **kwargs):
             self.pre_test()
-            res = bench_decorator(func)(*args, **kwargs)
+            res = bench_decorator(func, loops)(*args, **kwargs)
             self.post_test()
             return res
 
         return wrapper
 
-    def __with_prepost_async(self, func, asynch: bool = True):
+    def __with_prepost_async(self, func, asynch: bool = True, loops: int = 1):
         async def wrapper(*args, **kwargs):
             if inspect.iscoroutinefunction(self.pre_test):
                 await self.pre_test()
@@ -74,9 +105,9 @@ class TestCaseExt:
                 self.pre_test()
 
             if asynch:
-                res = await bench_decorator_async(func)(*args, **kwargs)
+                res = await bench_decorator_async(func, loops=loops)(*args, **kwargs)
             else:
-                res = bench_decorator(func)(*args, **kwargs)
+                res = bench_decorator(func, loops)(*args, **kwargs)
 
             if inspect.iscoroutinefunction(self.post_test):
                 await self.post_test()
@@ -0,0 +1,219 @@
+import inspect
+import threading
+from contextvars import ContextVar, Token
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from cotests.exceptions import CoException
+
+if TYPE_CHECKING:
+    from ..runner.group import GroupRunner
+
+SCOPES = ('group', 'module', 'session')
+
+# runner of the running group
+_GROUP: ContextVar[Optional['GroupRunner']] = ContextVar('cotests_group', default=None)
+
+
+class Fixture:
+    """
+    Shared resource, created on first use in its scope and reused by all tests of the scope.
+    Function returns the value, or yields it & tears it down after the `yield`; async functions are awaited
+    """
+    def __init__(self, func: Callable, scope: str = 'group'):
+        assert scope in SCOPES, f'Unknown fixture scope: {scope}'
+        self.func = func
+        self.scope = scope
+        self.is_async = inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+        self.__name__ = func.__name__
+
+    def __repr__(self):
+        return f'<fixture {self.__name__} ({self.scope})>'
+
+    def __call__(self) -> Any:
+        runner = _GROUP.get()
+        if runner is None:
+            raise RuntimeError(f'Fixture {self.__name__} is used outside of tests')
+        return self.__store(runner).get(self)
+
+    def __store(self, runner: 'GroupRunner') -> 'FixtureStore':
+        if self.scope == 'session':
+            return runner.root.fixtures
+        if self.scope == 'module':
+            r = runner
+            while r is not None:
+                if r.test.is_module:
+                    return r.fixtures
+                r = r.parent
+            # not in a module: the whole run
+            return runner.root.fixtures
+        return runner.fixtures
+
+
+def fixture(func: Optional[Callable] = None, *, scope: str = 'group') -> Union[Fixture, Callable[[Callable], Fixture]]:
+    """`@fixture` or `@fixture(scope='module')`"""
+    if func is None:
+        return lambda f: Fixture(f, scope)
+    return Fixture(func, scope)
+
+
+class FixtureStore:
+    """Fixtures values of the scope; torn down in reverse order of creation"""
+    def __init__(self):
+        self.__values: Dict[Fixture, Any] = {}
+        # fixture & its generator, if any
+        self.__created: List[Tuple[Fixture, Any]] = []
+        # threads of load test create the fixture once; fixtures may use other fixtures
+        self.__lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.__created)
+
+    def get(self, fx: Fixture) -> Any:
+        if fx not in self.__values:
+            if fx.is_async:
+                import asyncio
+                # concurrent tests wait for the same creation
+                self.__values[fx] = asyncio.ensure_future(self.__create_async(fx))
+            else:
+                with self.__lock:
+                    if fx not in self.__values:
+                        self.__values[fx] = self.__create(fx)
+        return self.__values[fx]
+
+    def __create(self, fx: Fixture) -> Any:
+        res = fx.func()
+        if inspect.isgenerator(res):
+            value = next(res)
+            self.__created.append((fx, res))
+            return value
+        self.__created.append((fx, None))
+        return res
+
+    async def __create_async(self, fx: Fixture) -> Any:
+        try:
+            res = fx.func()
+            if inspect.isasyncgen(res):
+                value = await res.__anext__()
+                self.__created.append((fx, res))
+                return value
+            value = await res
+            self.__created.append((fx, None))
+            return value
+        except BaseException:
+            # next use tries again
+            del self.__values[fx]
+            raise
+
+    def __pop(self, keep: int) -> Iterator[Tuple[Fixture, Any]]:
+        while len(self.__created) > keep:
+            fx, gen = self.__created.pop()
+            del self.__values[fx]
+            yield fx, gen
+
+    @staticmethod
+    def __finish(fx: Fixture, gen: Any):
+        if gen.gi_frame is None:
+            raise RuntimeError(f'Fixture {fx.__name__} is closed before teardown')
+        try:
+            next(gen)
+        except StopIteration:
+            return
+        raise RuntimeError(f'Fixture {fx.__name__} has more than one yield')
+
+    def close(self, keep: int = 0) -> List[Exception]:
+        """Tear down fixtures created after the first `keep` ones; errors are returned"""
+        errors = []
+        for fx, gen in self.__pop(keep):
+            if gen is None:
+                continue
+            try:
+                assert not fx.is_async, f'Async fixture {fx.__name__} in sync group'
+                self.__finish(fx, gen)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    async def close_async(self, keep: int = 0) -> List[Exception]:
+        errors = []
+        for fx, gen in self.__pop(keep):
+            if gen is None:
+                continue
+            try:
+                if fx.is_async:
+                    if gen.ag_frame is None:
+                        raise RuntimeError(f'Fixture {fx.__name__} is closed before teardown')
+                    try:
+                        await gen.__anext__()
+                    except StopAsyncIteration:
+                        continue
+                    raise RuntimeError(f'Fixture {fx.__name__} has more than one yield')
+                self.__finish(fx, gen)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+
+def set_group(runner: 'GroupRunner') -> Token:
+    """Running group: fixtures are looked up from it"""
+    return _GROUP.set(runner)
+
+
+def reset_group(token: Token):
+    _GROUP.reset(token)
+
+
+def _worker_stores(parent: 'GroupRunner') -> List[Tuple[FixtureStore, int]]:
+    stores = []
+    r = parent
+    while r is not None:
+        stores.append((r.fixtures, len(r.fixtures)))
+        r = r.parent
+    return stores
+
+
+async def _close_async(stores: List[Tuple[FixtureStore, int]]) -> List[Exception]:
+    errors = []
+    for store, keep in stores:
+        errors.extend(await store.close_async(keep))
+    return errors
+
+
+async def _await_in_worker(coro: Any, stores: List[Tuple[FixtureStore, int]]) -> Any:
+    # in the loop of the test: its async generators are not closed on its shutdown yet
+    try:
+        res = await coro
+    except BaseException:
+        await _close_async(stores)
+        raise
+    errors = await _close_async(stores)
+    if errors:
+        raise CoException(errors, 'fixtures')
+    return res
+
+
+def worker_run(parent: 'GroupRunner', call: Callable[[], Any]) -> Any:
+    """
+    Test in worker process: fixtures of the parent groups, created in this process,
+    are torn down after the test, in the event loop of async test
+    """
+    stores = _worker_stores(parent)
+    token = _GROUP.set(parent)
+    try:
+        res = call()
+        if inspect.iscoroutine(res):
+            import asyncio
+            return asyncio.run(_await_in_worker(res, stores))
+    except BaseException:
+        # errors of the test itself go first
+        for store, keep in stores:
+            store.close(keep)
+        raise
+    finally:
+        _GROUP.reset(token)
+    errors = [e for store, keep in stores for e in store.close(keep)]
+    if errors:
+        raise CoException(errors, 'fixtures')
+    return res
+
+
+__all__ = ('Fixture', 'fixture', 'FixtureStore', 'set_group', 'reset_group', 'worker_run', 'SCOPES')
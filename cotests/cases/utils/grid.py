@@ -0,0 +1,73 @@
+from itertools import product
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+# axes names, values of each axis; points of the block: product or zip of the axes
+_Block = Tuple[Tuple[str, ...], Tuple[Tuple[Any, ...], ...], bool]
+
+
+class Grid:
+    """
+    Named axes of keyword arguments; points are expanded lazily while iterating.
+    `Grid(a=[1, 2], b='xy')` - product of axes; `Grid.zip(...)` - axes in parallel;
+    `grid1 * grid2` - product of grids.
+    """
+    def __init__(self, **axes: Iterable[Any]):
+        self.__blocks: List[_Block] = []
+        if axes:
+            self.__blocks.append(self.__block(axes, False))
+
+    @staticmethod
+    def __block(axes: Dict[str, Iterable[Any]], is_zip: bool) -> _Block:
+        values = tuple(tuple(v) for v in axes.values())
+        if is_zip:
+            assert len(set(map(len, values))) == 1, 'Zipped axes have different length'
+        return tuple(axes), values, is_zip
+
+    @classmethod
+    def zip(cls, **axes: Iterable[Any]) -> 'Grid':
+        grid = cls()
+        grid.__blocks.append(cls.__block(axes, True))
+        return grid
+
+    def __mul__(self, other: 'Grid') -> 'Grid':
+        names = [n for b in (*self.__blocks, *other.__blocks) for n in b[0]]
+        assert len(names) == len(set(names)), 'Grid axes conflict'
+        grid = Grid()
+        grid.__blocks = [*self.__blocks, *other.__blocks]
+        return grid
+
+    @staticmethod
+    def __points(block: _Block) -> Iterator[Tuple[Any, ...]]:
+        _, values, is_zip = block
+        return zip(*values) if is_zip else product(*values)
+
+    def __product(self, i: int) -> Iterator[Tuple[Any, ...]]:
+        # not `product()` of blocks: it would build all points of each block first
+        if i == len(self.__blocks):
+            yield ()
+            return
+        for head in self.__points(self.__blocks[i]):
+            for tail in self.__product(i + 1):
+                yield (*head, *tail)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        names = [n for b in self.__blocks for n in b[0]]
+        for values in self.__product(0):
+            yield dict(zip(names, values))
+
+    def __len__(self) -> int:
+        n = 1
+        for _, values, is_zip in self.__blocks:
+            if is_zip:
+                n *= len(values[0]) if values else 1
+            else:
+                for v in values:
+                    n *= len(v)
+        return n
+
+    @staticmethod
+    def label(point: Dict[str, Any]) -> str:
+        return ','.join(f'{k}={v}' for k, v in point.items())
+
+
+__all__ = ('Grid',)
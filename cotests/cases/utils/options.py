@@ -0,0 +1,149 @@
+import os
+from typing import TYPE_CHECKING, Optional, Union, Dict, Any, Tuple, Sequence
+
+if TYPE_CHECKING:
+    from cotests.typ import BenchParams, RunParams
+
+
+DEFAULT_CALIBRATE_TIME = .02
+GC_MODES = ('default', 'disable', 'freeze')
+# declaration order; previously failed, longest or shortest tests first
+ORDERS = ('declared', 'failed', 'slowest', 'fastest')
+DEFAULT_LOAD_DURATION = 1.
+DEFAULT_HISTORY_PATH = os.path.join('.cotests', 'history.jsonl')
+DEFAULT_CACHE_PATH = os.path.join('.cotests', 'cache.json')
+DEFAULT_INDEX_PATH = os.path.join('.cotests', 'index.json')
+DEFAULT_TIMINGS_PATH = os.path.join('.cotests', 'timings.json')
+# shard i of N
+DEFAULT_SHARD_REPORT = os.path.join('.cotests', 'shard-{}-of-{}.json')
+DEFAULT_PROFILE_PATH = os.path.join('.cotests', 'profile')
+DEFAULT_SAMPLING_PATH = os.path.join('.cotests', 'stacks')
+DEFAULT_SAMPLING_INTERVAL = .001
+
+
+class TestOptions:
+    KEYS: Tuple[str, ...] = ('workers', 'concurrency', 'memory', 'profile', 'profile_top', 'order', 'timings')
+
+    def __init__(
+            self,
+            *,
+            workers: int = 1,
+            concurrency: int = 1,
+            memory: bool = False,
+            profile: Union[bool, str] = False,
+            profile_top: int = 10,
+            order: str = 'declared',
+            timings: Union[bool, str] = False,
+    ):
+        # processes for child tests of the root group
+        assert isinstance(workers, int) and workers >= 1, 'Incorrect workers count'
+        self.workers = workers
+        # async tests of each group at once
+        assert isinstance(concurrency, int) and concurrency >= 1, 'Incorrect concurrency'
+        self.concurrency = concurrency
+        # tracemalloc peak & retained memory of each case
+        self.memory = memory
+        # directory for cProfile stats of each case; top functions of each group
+        self.profile: Optional[str] = DEFAULT_PROFILE_PATH if profile is True else (profile or None)
+        assert isinstance(profile_top, int) and profile_top >= 0, 'Incorrect profile top count'
+        self.profile_top = profile_top
+        # order of tests in each group, by durations & outcomes of the last run
+        assert order in ORDERS, 'Incorrect order'
+        self.order = order
+        # file of durations & outcomes, updated after the run; needed for order
+        self.timings: Optional[str] = DEFAULT_TIMINGS_PATH if timings is True else (timings or None)
+        if order != 'declared' and not self.timings:
+            self.timings = DEFAULT_TIMINGS_PATH
+
+    @classmethod
+    def split_kwargs(cls, kwargs: Dict[str, Any]) -> Union['RunParams', 'BenchParams']:
+        """Pop run options from mixed group & run kwargs."""
+        # noinspection PyTypeChecker
+        return {k: kwargs.pop(k) for k in cls.KEYS if k in kwargs}
+
+
+class BenchOptions(TestOptions):
+    KEYS = (
+        'calibrate', 'baseline', 'subtract_baseline', 'stats', 'warmup', 'isolate', 'memory', 'cpu', 'gc',
+        'profile', 'profile_top', 'sampling', 'sampling_interval',
+        'load', 'threads', 'load_duration', 'load_requests', 'export', 'history', 'tag',
+    )
+
+    def __init__(
+            self,
+            iterations: int = 1,
+            *,
+            calibrate: Union[bool, float] = False,
+            baseline: bool = False,
+            subtract_baseline: bool = False,
+            stats: bool = False,
+            warmup: Union[int, str] = 0,
+            isolate: int = 0,
+            load: Optional[Sequence[int]] = None,
+            threads: Optional[Sequence[int]] = None,
+            load_duration: float = DEFAULT_LOAD_DURATION,
+            load_requests: Optional[int] = None,
+            export: Union[str, Sequence[str]] = (),
+            history: Union[bool, str] = False,
+            tag: Optional[str] = None,
+            memory: bool = False,
+            cpu: bool = False,
+            gc: Optional[str] = None,
+            profile: Union[bool, str] = False,
+            profile_top: int = 10,
+            sampling: Union[bool, str] = False,
+            sampling_interval: float = DEFAULT_SAMPLING_INTERVAL,
+    ):
+        super().__init__(memory=memory, profile=profile, profile_top=profile_top)
+        assert iterations >= 1, 'Incorrect iterations count'
+        self.iterations = iterations
+        # min duration of one timing sample (sec) or None
+        self.calibrate: Optional[float] = self.__get_time(calibrate, DEFAULT_CALIBRATE_TIME)
+        # measure empty function with the same args
+        self.baseline = baseline or subtract_baseline
+        self.subtract_baseline = subtract_baseline
+        # median, stdev, percentiles, outliers
+        self.stats = stats
+        # count of not measured iterations or `auto`
+        assert warmup == 'auto' or (isinstance(warmup, int) and warmup >= 0), 'Incorrect warmup'
+        self.warmup = warmup
+        # run each benchmark in N fresh processes
+        assert isinstance(isolate, int) and isolate >= 0, 'Incorrect isolate count'
+        self.isolate = isolate
+        # concurrency levels of closed-loop load for coroutine functions
+        assert not load or all(isinstance(x, int) and x >= 1 for x in load), 'Incorrect load levels'
+        self.load = load
+        # threads counts for sync functions
+        assert not threads or all(isinstance(x, int) and x >= 1 for x in threads), 'Incorrect threads counts'
+        self.threads = threads
+        # for each load & threads level: requests count or duration (sec)
+        assert load_requests is None or load_requests >= 1, 'Incorrect load requests count'
+        assert load_duration > 0, 'Incorrect load duration'
+        self.load_requests = load_requests
+        self.load_duration = load_duration
+        # result files: .json, .jsonl, .csv, .md
+        self.export: Tuple[str, ...] = (export,) if isinstance(export, str) else tuple(export)
+        # process & thread CPU time per call, CPU utilization
+        self.cpu = cpu
+        # GC mode while timing: `default`, `disable` or `freeze`; collections & pause time
+        assert gc is None or gc in GC_MODES, 'Incorrect GC mode'
+        self.gc = gc
+        # directory for collapsed stacks of each case, sampled in a separate pass after timing
+        self.sampling: Optional[str] = DEFAULT_SAMPLING_PATH if sampling is True else (sampling or None)
+        assert sampling_interval > 0, 'Incorrect sampling interval'
+        self.sampling_interval = sampling_interval
+        # append the run to history file; tag to compare with it later
+        self.history: Optional[str] = DEFAULT_HISTORY_PATH if history is True else (history or None)
+        self.tag = tag
+
+    @staticmethod
+    def __get_time(val: Union[bool, float], default: float) -> Optional[float]:
+        if val is True:
+            return default
+        if val:
+            assert val > 0, 'Incorrect time value'
+            return float(val)
+        return None
+
+
+__all__ = ('TestOptions', 'BenchOptions',)
@@ -0,0 +1,109 @@
+import mmap
+import os
+from itertools import cycle, zip_longest
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+_END = object()
+
+
+class Source:
+    """
+    Re-iterable stream of arguments records: the factory opens a new stream on each iteration,
+    so a benchmark iteration reads records one by one and does not keep them in memory
+    """
+    def __init__(self, factory: Callable[..., Iterator[Any]], *args: Any):
+        self.__factory = factory
+        self.__args = args
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.__factory(*self.__args))
+
+    @classmethod
+    def jsonl(cls, path: str) -> 'Source':
+        """Record of each line: list - args, dict - kwargs"""
+        return cls(_jsonl, path)
+
+    @classmethod
+    def mmap(cls, path: str, size: Optional[int] = None) -> 'Source':
+        """
+        Records of binary file, each record is the single `bytes` argument
+        :param size: size of each record; default - each record with 4-byte little-endian length before it
+        """
+        return cls(_mmap, path, size)
+
+
+def _jsonl(path: str) -> Iterator[Any]:
+    import json
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _mmap(path: str, size: Optional[int]) -> Iterator[Any]:
+    with open(path, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            pos, end = 0, len(m)
+            while pos < end:
+                if size:
+                    n = size
+                else:
+                    n = int.from_bytes(m[pos:pos + 4], 'little')
+                    pos += 4
+                yield m[pos:pos + n],
+                pos += n
+
+
+class _Once:
+    """Iterator as arguments source: only for single pass"""
+    def __init__(self, it: Iterator[Any]):
+        self.__it: Optional[Iterator[Any]] = it
+
+    def __iter__(self) -> Iterator[Any]:
+        assert self.__it is not None, 'Iterator of arguments is consumed; use Source for several iterations'
+        it, self.__it = self.__it, None
+        return it
+
+
+class Params:
+    """Re-iterable params of test: records of sources, mapped to (args, kwargs)"""
+    def __init__(self, func: Callable[..., Any], *sources: Iterable[Any]):
+        self.__func = func
+        self.__sources = sources
+
+    def __iter__(self) -> Iterator[Any]:
+        for records in zip_longest(*self.__sources, fillvalue=_END):
+            assert _END not in records, 'Personal args & kwargs have different length'
+            yield self.__func(*records)
+
+    def map(self, func: Callable[..., Any]) -> 'Params':
+        return Params(func, self)
+
+
+def is_stream(items: Any) -> bool:
+    return items is not None and not isinstance(items, Sequence)
+
+
+def as_source(items: Iterable[Any]) -> Iterable[Any]:
+    if isinstance(items, (Source, Params)) or iter(items) is not items:
+        return items
+    return _Once(items)
+
+
+def map_params(params: Iterable[Any], func: Callable[..., Any]) -> Iterable[Any]:
+    """Params with each (args, kwargs) mapped; lazy for streams"""
+    if isinstance(params, Params):
+        return params.map(func)
+    return [func(p) for p in params]
+
+
+def cycle_params(params: Iterable[Any]) -> Iterator[Any]:
+    """Params in turn without end; streams are reopened instead of cached"""
+    if isinstance(params, Params):
+        return (p for _ in iter(int, 1) for p in params)
+    return cycle(params)
+
+
+__all__ = ('Source', 'Params', 'is_stream', 'as_source', 'map_params', 'cycle_params')
@@ -1,4 +1,3 @@
-import asyncio
 import inspect
 from typing import TYPE_CHECKING, Awaitable, Optional, Any
 
@@ -8,12 +7,13 @@ if TYPE_CHECKING:
 
 def try_to_run(t: Optional[Awaitable[None]]) -> 'RunResult':
     if t and inspect.iscoroutine(t):
+        import asyncio
         # try to run
         try:
             asyncio.get_running_loop()
         except RuntimeError:
             # print('Run in new loop')
-            asyncio.run(t)
+            return asyncio.run(t)
         else:
             # print('Cannot run. Return coroutine')
             return t
@@ -0,0 +1,183 @@
+import fnmatch
+import importlib.util
+import inspect
+import json
+import os
+from types import ModuleType
+from typing import Any, Collection, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .case import CoTestCase
+from .cases import CoTestGroup
+from .cases.group import LazyCases, is_unittest_class
+from .cases.runner.utils.pool import can_fork
+from .exceptions import InitGroupErrors
+
+INDEX_VERSION = 1
+# relative path with `/` & path of test file
+TestFile = Tuple[str, str]
+# name, object, kind: group, test, unittest
+ModuleItem = Tuple[str, Any, str]
+
+
+def _match(rel: str, patterns: Optional[Sequence[str]]) -> bool:
+    return bool(patterns) and any(fnmatch.fnmatchcase(rel, p) for p in patterns)
+
+
+def find_files(
+        dir_path: str,
+        file_prefix: str = 't_',
+        ignore_files: Optional[Collection[str]] = None,
+        recursive: bool = False,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+) -> List[TestFile]:
+    """Test files by name prefix; globs are matched with the path relative to `dir_path`"""
+    files = []
+
+    def scan(d: str, rel: str):
+        for sd in sorted(os.scandir(d), key=lambda e: e.name):
+            r = rel + sd.name
+            if sd.is_dir():
+                if recursive and not sd.name.startswith(('.', '__')):
+                    scan(sd.path, r + '/')
+            elif sd.is_file():
+                if not (sd.name.startswith(file_prefix) and sd.name.endswith('.py')):
+                    continue
+                if ignore_files and sd.name in ignore_files:
+                    continue
+                if include and not _match(r, include) or _match(r, exclude):
+                    continue
+                files.append((r, sd.path))
+    scan(dir_path, '')
+    return files
+
+
+def import_file(path: str, module_name: str) -> ModuleType:
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    # sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def module_items(module: ModuleType, module_name: str) -> List[ModuleItem]:
+    items = []
+    for k, v in module.__dict__.items():
+        if k.startswith('_'):
+            continue
+
+        if isinstance(v, CoTestGroup):
+            items.append((k, v, 'group'))
+        elif inspect.isfunction(v) and v.__module__ == module_name and v.__name__.startswith('test_'):
+            items.append((k, v, 'test'))
+        elif inspect.isclass(v) and v.__module__ == module_name:
+            if issubclass(v, CoTestCase):
+                items.append((k, v, 'test'))
+            elif is_unittest_class(v):
+                items.append((k, v, 'unittest'))
+    return items
+
+
+def runnable(items: List[ModuleItem]) -> List[ModuleItem]:
+    """If groups are found, other tests (except unittests) are ignored"""
+    kinds = ('group', 'unittest') if any(kind == 'group' for _, _, kind in items) else ('test', 'unittest')
+    return [i for i in items if i[2] in kinds]
+
+
+def module_groups(items: List[ModuleItem], module_name: str) -> List[CoTestGroup]:
+    groups = []
+    for kind in ('group', 'test', 'unittest'):
+        tests = [v for _, v, k in runnable(items) if k == kind]
+        if tests:
+            groups.append(CoTestGroup(*tests, name=module_name))
+    return groups
+
+
+def is_selected(rel: str, name: str, select: Optional[Sequence[str]]) -> bool:
+    """By globs of test ids: `<relative path>::<name>`"""
+    return not select or _match(f'{rel}::{name}', select)
+
+
+def select_items(items: List[ModuleItem], rel: str, select: Optional[Sequence[str]]) -> List[ModuleItem]:
+    return [i for i in items if is_selected(rel, i[0], select)]
+
+
+def lazy_group(rel: str, path: str, is_async: bool, select: Optional[Sequence[str]] = None) -> CoTestGroup:
+    """Group of test file, imported on the first run (in worker process, with workers)"""
+    def cases() -> Iterator[Any]:
+        items = select_items(module_items(import_file(path, rel), rel), rel, select)
+        for g in module_groups(items, rel):
+            if g.init_errors:
+                raise InitGroupErrors(g.init_errors)
+            yield from g.tests
+
+    group = CoTestGroup(LazyCases(cases, is_async), name=rel)
+    group.is_module = True
+    return group
+
+
+def _index_file(path: str, module_name: str) -> Dict[str, Any]:
+    try:
+        items = module_items(import_file(path, module_name), module_name)
+    except Exception as e:
+        return {'tests': [], 'is_async': False, 'error': f'{type(e).__name__}: {e}'}
+    return {
+        'tests': [k for k, _, _ in runnable(items)],
+        'is_async': any(g.is_async for g in module_groups(items, module_name)),
+        'error': None,
+    }
+
+
+class TestIndex:
+    """Tests of each file, by file mtime & size; built by import in worker processes"""
+    def __init__(self, path: str):
+        self.path = path
+        self.files: Dict[str, Dict[str, Any]] = {}
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == INDEX_VERSION:
+            self.files = data['files']
+
+    @staticmethod
+    def __stat(path: str) -> List[int]:
+        st = os.stat(path)
+        return [st.st_mtime_ns, st.st_size]
+
+    def update(self, files: Sequence[TestFile], workers: int = 0) -> int:
+        """Index new & changed files; count of indexed files"""
+        stale = []
+        for rel, path in files:
+            entry = self.files.get(os.path.abspath(path))
+            if not entry or entry['stat'] != self.__stat(path):
+                stale.append((rel, path))
+        if stale:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # not imported in this process: run imports it again, maybe in worker
+            with ProcessPoolExecutor(
+                    min(workers or os.cpu_count() or 1, len(stale)),
+                    mp_context=multiprocessing.get_context('fork') if can_fork() else None,
+            ) as pool:
+                entries = pool.map(_index_file, [p for _, p in stale], [r for r, _ in stale])
+                for (rel, path), entry in zip(stale, entries):
+                    self.files[os.path.abspath(path)] = {'stat': self.__stat(path), **entry}
+        return len(stale)
+
+    def get(self, path: str) -> Dict[str, Any]:
+        return self.files[os.path.abspath(path)]
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': INDEX_VERSION, 'files': self.files}, f, indent=1)
+        os.replace(tmp, self.path)
+
+
+__all__ = (
+    'TestFile', 'TestIndex', 'find_files', 'import_file', 'module_items', 'module_groups',
+    'runnable', 'is_selected', 'select_items', 'lazy_group',
+)
@@ -9,6 +9,16 @@ class CoException(Exception):
         self.__errors = errors
         self.__where = where
 
+    def __reduce__(self):
+        return CoException, (self.__errors, self.__where)
+
+    def picklable(self) -> 'CoException':
+        """Copy to send from worker process"""
+        return CoException(
+            [e.picklable() if isinstance(e, CoException) else _picklable(e) for e in self.__errors],
+            self.__where,
+        )
+
     @property
     def errors(self):
         return self.__errors_iter(())
@@ -34,4 +44,29 @@ class UnknownTestTypeError(Exception):
     ...
 
 
-__all__ = ('CoException', 'InitGroupErrors', 'UnknownTestTypeError',)
+class WorkerError(Exception):
+    """Not picklable error from worker process"""
+    def __init__(self, type_name: str, message: str):
+        super().__init__(type_name, message)
+        self.type_name = type_name
+
+    def __str__(self):
+        return self.args[1]
+
+
+def _picklable(e: Exception) -> Exception:
+    import pickle
+    try:
+        pickle.loads(pickle.dumps(e))
+    except Exception:
+        return WorkerError(type(e).__name__, str(e))
+    return e
+
+
+def error_type_name(e: Exception) -> str:
+    if isinstance(e, WorkerError):
+        return e.type_name
+    return type(e).__name__
+
+
+__all__ = ('CoException', 'InitGroupErrors', 'UnknownTestTypeError', 'WorkerError', 'error_type_name',)
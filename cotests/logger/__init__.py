@@ -1,10 +1,28 @@
 import io
 import sys
-
-from typing import Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Iterator, TextIO
 
 
 _STREAM = sys.stdout
+# redirected output, e.g. in worker process
+_CAPTURE: 'ContextVar[TextIO]' = ContextVar('cotests_capture')
+
+
+def _stream() -> TextIO:
+    return _CAPTURE.get(_STREAM)
+
+
+@contextmanager
+def capture() -> Iterator[io.StringIO]:
+    """Buffer all loggers output in current context"""
+    buf = io.StringIO()
+    token = _CAPTURE.set(buf)
+    try:
+        yield buf
+    finally:
+        _CAPTURE.reset(token)
 
 
 class CoLogger(io.StringIO):
@@ -31,43 +49,44 @@ class CoLogger(io.StringIO):
 
     def write(self, msg: str):
         # support multi-line messages
+        stream = _stream()
         if self.__new_line:
-            _STREAM.write(self.__prefix)
+            stream.write(self.__prefix)
         lines = iter(msg.splitlines(True))
 
         line = next(lines)
-        _STREAM.write(line)
+        stream.write(line)
 
         for line in lines:
-            _STREAM.write(self.__prefix + line)
+            stream.write(self.__prefix + line)
 
         self.__new_line = line.endswith(self.TERMINATOR)
 
     def flush(self):
-        _STREAM.flush()
+        _stream().flush()
 
     # CUSTOM
 
     def writeln(self, msg: str):
         # self.write(msg + self.TERMINATOR)
-        _STREAM.write(self.__prefix + msg + self.TERMINATOR)
+        _stream().write(self.__prefix + msg + self.TERMINATOR)
         self.__new_line = True
 
     # RAW
 
     @staticmethod
     def write_raw(msg: str):
-        _STREAM.write(msg)
+        _stream().write(msg)
 
     def end_line(self, msg: str):
-        _STREAM.write(msg + self.TERMINATOR)
+        _stream().write(msg + self.TERMINATOR)
         self.__new_line = True
 
     def new_line(self, msg: str):
-        _STREAM.write(self.__prefix + msg)
+        _stream().write(self.__prefix + msg)
         self.__new_line = False
 
 
 logger = CoLogger()
 
-__all__  = ('logger', 'CoLogger', )
+__all__  = ('logger', 'CoLogger', 'capture', )
@@ -1,77 +1,184 @@
 import inspect
-import importlib.util
-import os
-import unittest
-from typing import List, Optional, Collection
-from .case import CoTestCase
+from typing import TYPE_CHECKING, Dict, List, Optional, Collection, Sequence, Tuple, Union
 from .cases import CoTestGroup, test_groups
+from .cases.runner.utils.result import GroupResult
+from .cases.utils.options import DEFAULT_CACHE_PATH, DEFAULT_INDEX_PATH, DEFAULT_SHARD_REPORT, DEFAULT_TIMINGS_PATH
+from .discovery import (
+    TestFile, TestIndex, find_files, import_file, is_selected, module_items, module_groups, select_items, lazy_group
+)
 from cotests.logger import logger
 
+if TYPE_CHECKING:
+    from .cases.runner.utils.cache import CachedFile, ModuleCache
+    from .cases.runner.utils.shard import Shard
+    from .typ import Unpack, RunParams
+
+
+def _index(files: Sequence[TestFile], index: Union[bool, str], workers: int) -> TestIndex:
+    idx = TestIndex(DEFAULT_INDEX_PATH if index is True else index)
+    # all CPUs for the index, if run is not parallel
+    if idx.update(files, workers if workers > 1 else 0):
+        idx.save()
+    return idx
+
+
+def _durations(timings: Union[bool, str, None]) -> Dict[str, float]:
+    """Durations of tests & test files from the timings file"""
+    from .cases.runner.utils.timings import Timings
+    tests = Timings(timings if isinstance(timings, str) else DEFAULT_TIMINGS_PATH).tests
+    return {k: v['time'] for k, v in tests.items()}
+
+
+def list_tests(
+        dir_path: str,
+        *,
+        file_prefix: str = 't_',
+        ignore_files: Optional[Collection[str]] = None,
+        recursive: bool = False,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        select: Optional[Sequence[str]] = None,
+        index: Union[bool, str] = True,
+        workers: int = 0,
+) -> List[str]:
+    """Ids of tests `<relative path>::<name>` from the index; only new & changed files are imported"""
+    files = find_files(dir_path, file_prefix, ignore_files, recursive, include, exclude)
+    idx = _index(files, index, workers)
+    return [
+        f'{rel}::{name}'
+        for rel, path in files
+        for name in idx.get(path)['tests']
+        if is_selected(rel, name, select)
+    ]
+
 
 def test_module(
         dir_path: str,
         *,
         file_prefix: str = 't_',
         ignore_files: Optional[Collection[str]] = None,
+        recursive: bool = False,
+        include: Optional[Sequence[str]] = None,
+        exclude: Optional[Sequence[str]] = None,
+        select: Optional[Sequence[str]] = None,
+        index: Union[bool, str] = False,
+        incremental: Union[bool, str] = False,
+        shard: Optional[str] = None,
+        report: Optional[str] = None,
+        **kwargs: 'Unpack[RunParams]',
 ):
+    """
+    :param recursive: search in subdirectories too
+    :param include: globs of paths relative to `dir_path`: only matched files
+    :param exclude: globs of paths relative to `dir_path`: skip matched files
+    :param select: globs of test ids `<relative path>::<name>`
+    :param index: keep tests of each file by its mtime (`True` - `.cotests/index.json`): files are listed
+                  & selected without import, and imported on run (in worker processes, with workers)
+    :param incremental: skip files, which sources (with imported local modules) are not changed
+                        since the last run without errors; cache file (`True` - `.cotests/cache.json`);
+                        files, filtered by `select`, are not cached
+    :param shard: `i/N` - run only test files of shard `i` of `N` (from 1): the same split on each node,
+                  balanced by durations from the timings file, if any, otherwise by hash of the path
+    :param report: result file of the run, to merge shards (with shard - `.cotests/shard-i-of-N.json`)
+    """
     logger.writeln(f'Search tests in {dir_path}..')
     tests: List[CoTestGroup] = []
+    files = find_files(dir_path, file_prefix, ignore_files, recursive, include, exclude)
+    report_to: Optional[Tuple[str, 'Shard', List[str]]] = None
+    if shard or report:
+        from .cases.runner.utils.shard import parse_shard, split
+        i, n = parse_shard(shard or '1/1')
+        ids = [rel for rel, _ in files]
+        if n > 1:
+            own = set(split(ids, n, _durations(kwargs.get('timings')))[i - 1])
+            files = [f for f in files if f[0] in own]
+            logger.writeln(f'Shard {i}/{n}: {len(files)} of {len(ids)} test files')
+        report_to = (report or DEFAULT_SHARD_REPORT.format(i, n), (i, n), ids)
+    idx = _index(files, index, kwargs.get('workers', 1)) if index else None
+    if incremental:
+        from .cases.runner.utils.cache import ModuleCache, local_roots, sources_hash
+        cache = ModuleCache(DEFAULT_CACHE_PATH if incremental is True else incremental)
+        roots = local_roots(dir_path)
+    else:
+        cache, roots = None, []
+    cached_files: List['CachedFile'] = []
+    skipped = 0
+
+    for module_name, file_path in files:
+        if cache:
+            hash_ = sources_hash(file_path, roots)
+            if cache.is_fresh(file_path, hash_):
+                logger.writeln(f'{"*" * 10} {module_name} : not changed, skip')
+                skipped += 1
+                continue
 
-    for sd in os.scandir(dir_path):
-        if sd.is_dir():
-            ...
-        elif sd.is_file():
-            if sd.name.startswith(file_prefix) and sd.name.endswith('.py'):
-                if ignore_files and sd.name in ignore_files:
-                    continue
-                module_name = sd.name
-                file_path = sd.path
-                logger.writeln(f'{"*" * 10} {module_name}')
-
-                spec = importlib.util.spec_from_file_location(module_name, file_path)
-                module = importlib.util.module_from_spec(spec)
-                # sys.modules[module_name] = module
-                spec.loader.exec_module(module)
-
-                tmp_tests = []
-                tmp_groups = []
-                tmp_unittests = []
-                for k, v in module.__dict__.items():
-                    if k.startswith('_'):
-                        continue
-
-                    if isinstance(v, CoTestGroup):
-                        tmp_groups.append(v)
-                    elif inspect.isfunction(v) and v.__module__ == module_name and v.__name__.startswith('test_'):
-                        tmp_tests.append(v)
-                    elif inspect.isclass(v) and v.__module__ == module_name:
-                        if issubclass(v, CoTestCase):
-                            tmp_tests.append(v)
-                        elif issubclass(v, unittest.TestCase):
-                            tmp_unittests.append(v)
-                        else:
-                            continue
-                    else:
-                        continue
-                    logger.writeln(f' * {k} : {type(v)}')
-
-                # tests.append(CoTestGroup(*tmp_groups, *tmp_tests, name=module_name))
-                if tmp_groups:
-                    tests.append(CoTestGroup(*tmp_groups, name=module_name))
-                elif tmp_tests:
-                    tests.append(CoTestGroup(*tmp_tests, name=module_name))
-
-                if tmp_unittests:
-                    tests.append(CoTestGroup(*tmp_unittests, name=module_name))
+        if idx:
+            entry = idx.get(file_path)
+            names = [n for n in entry['tests'] if is_selected(module_name, n, select)]
+            # import error is shown on run
+            if not names and not entry['error']:
+                continue
+            logger.writeln(f'{"*" * 10} {module_name}')
+            for name in names:
+                logger.writeln(f' * {name}')
+            module_tests = [lazy_group(module_name, file_path, entry['is_async'], select)]
+            filtered = len(names) < len(entry['tests'])
         else:
-            logger.writeln(f'o_O {sd}')
+            all_items = module_items(import_file(file_path, module_name), module_name)
+            items = select_items(all_items, module_name, select)
+            filtered = len(items) < len(all_items)
+            if select and not items:
+                continue
+            logger.writeln(f'{"*" * 10} {module_name}')
+            for k, v, _ in items:
+                logger.writeln(f' * {k} : {type(v)}')
+            module_tests = module_groups(items, module_name)
+            for g in module_tests:
+                g.is_module = True
+
+        tests.extend(module_tests)
+        # not all tests of the file are run: it is not fresh after the run
+        if cache and module_tests and not filtered:
+            cached_files.append((file_path, module_name, hash_, len(module_tests)))
+
+    if cache and skipped and not tests:
+        logger.writeln(f'All {skipped} test files are not changed')
+        return _finish(GroupResult('__main__'), None, [], report_to)
+    if report_to and not tests:
+        logger.writeln('No tests in the shard')
+        return _finish(GroupResult('__main__'), None, [], report_to)
 
     logger.writeln("""
     +---------------------+
     |    Start CoTests    |
     +---------------------+
     """)
-    return test_groups(*tests)
+    result = test_groups(*tests, **kwargs)
+    if not (cache or report_to):
+        return result
+    if inspect.isawaitable(result):
+        return _finish_async(result, cache, cached_files, report_to)
+    return _finish(result, cache, cached_files, report_to)
+
+
+def _finish(
+        result: GroupResult,
+        cache: Optional['ModuleCache'],
+        files: List['CachedFile'],
+        report: Optional[Tuple[str, 'Shard', List[str]]],
+) -> GroupResult:
+    if cache:
+        cache.update(files, result)
+        cache.save()
+    if report:
+        from .cases.runner.utils.shard import write_report
+        path, shard, ids = report
+        write_report(path, shard, ids, result)
+    return result
+
+
+async def _finish_async(result, *args) -> GroupResult:
+    return _finish(await result, *args)
 
 
-__all__ = ('test_module', )
+__all__ = ('test_module', 'list_tests')
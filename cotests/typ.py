@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Callable, Tuple, Any, Mapping, Iterable, Union, Coroutine, List, Type, Awaitable, TypedDict
+from typing import TYPE_CHECKING, Callable, Tuple, Any, Mapping, Iterable, Union, Coroutine, List, Type, Awaitable, TypedDict, Sequence
 
 
 # RESULT_TUPLE_SINGLE = Tuple[float]
@@ -9,7 +9,8 @@ TestFunction = Union[Callable, Coroutine]
 TestArgs = Iterable[Any]
 TestKwargs = Mapping[str, Any]
 # TestTuple = Tuple[TestFunction, TestArgs, TestKwargs]
-CoArgsList = List[Tuple['TestArgs', 'TestKwargs']]
+# list, or re-iterable stream of records
+CoArgsList = Iterable[Tuple['TestArgs', 'TestKwargs']]
 RunResult = Union[None, Awaitable[None]]
 TestCallable = Callable[[], RunResult]
 
@@ -20,6 +21,7 @@ if TYPE_CHECKING:
     from cotests.cases.abstract import AbstractTestCase
     from cotests.cases.utils.args import CoTestArgs
     from cotests.cases.utils.case_ext import TestCaseExt
+    from cotests.cases.utils.grid import Grid
 
     if sys.version_info[:2] >= (3, 11):
         from typing import Unpack
@@ -37,6 +39,9 @@ class TestParamsCase(TypedDict, total=False):
     personal_kwargs: Iterable[TestKwargs]
     pre_test: TestCallable
     post_test: TestCallable
+    sweep: Iterable[int]
+    sweep_input: Callable[[int], Any]
+    grid: 'Grid'
 
 
 class TestParamsName(TestParamsCase, total=False):
@@ -48,3 +53,52 @@ class TestParamsFull(TestParamsName, total=False):
     cotest_ext: 'TestCaseExt'
     constructor: TestCallable
     destructor: TestCallable
+
+
+class RunParams(TypedDict, total=False):
+    workers: int
+    concurrency: int
+    memory: bool
+    profile: Union[bool, str]
+    profile_top: int
+    order: str
+    timings: Union[bool, str]
+
+
+class RunParamsName(TestParamsName, RunParams, total=False):
+    ...
+
+
+class RunParamsCase(TestParamsCase, RunParams, total=False):
+    ...
+
+
+class BenchParams(TypedDict, total=False):
+    calibrate: Union[bool, float]
+    baseline: bool
+    subtract_baseline: bool
+    stats: bool
+    warmup: Union[int, str]
+    isolate: int
+    load: Sequence[int]
+    threads: Sequence[int]
+    load_duration: float
+    load_requests: int
+    export: Union[str, Sequence[str]]
+    history: Union[bool, str]
+    tag: str
+    memory: bool
+    cpu: bool
+    gc: str
+    profile: Union[bool, str]
+    profile_top: int
+    sampling: Union[bool, str]
+    sampling_interval: float
+
+
+class BenchParamsName(TestParamsName, BenchParams, total=False):
+    ...
+
+
+class BenchParamsCase(TestParamsCase, BenchParams, total=False):
+    ...
@@ -49,3 +49,21 @@ test_batch(
     personal_args=[(x,) for x in range(len(tests_list))],
     personal_kwargs=[{'a': x} for x in range(len(tests_list))],
 )
+
+# ... with a grid of kwargs: each point is a separate case, like test_0[a=1,b=x]
+# points are created while running: Grid(a=..., b=...) - product, Grid.zip(...) - in parallel
+from cotests import Grid
+test_batch(
+    *tests_list,
+    grid=Grid(a=[1, 2], b='xy') * Grid.zip(c=[1, 2], d=[3, 4]),
+)
+
+# ... with streamed records: one record in memory at a time
+# Source(factory, *args) - factory(*args) opens new stream on each iteration;
+# Source.jsonl(path) - record of each line: list - args, dict - kwargs;
+# Source.mmap(path, size=None) - records of binary file (fixed size or length-prefixed) as single `bytes` argument
+from cotests import Source
+test_batch(
+    *tests_list,
+    personal_kwargs=Source(lambda n: ({'a': x} for x in range(n)), 1000),
+)
@@ -0,0 +1,532 @@
+import asyncio
+import threading
+
+from cotests.cases.cases import FunctionTestCase, CoroutineFunctionTestCase
+from cotests.cases.runner.case import _loops_range, Warmup, CpuClock
+from cotests.cases.runner.utils.load import closed_loop, thread_loop
+from cotests.cases.runner.utils.stats import Stats, process_spread
+from cotests.cases.utils.case_ext import bench_decorator
+
+
+def test_loops_range():
+    r = _loops_range()
+    assert [next(r) for _ in range(7)] == [1, 2, 5, 10, 20, 50, 100]
+
+
+def test_bench_loop():
+    calls = []
+    t = bench_decorator(calls.append, 10)(1)
+    assert calls == [1] * 10
+    assert t > 0
+
+
+def test_calibrate_reset():
+    from cotests import CoTestGroup
+    from cotests.logger import capture
+    calls = []
+    g = CoTestGroup(lambda: calls.append(1), name='g')
+    with capture():
+        g.run_bench(2, calibrate=.001)
+        calls.clear()
+        # calibrated loops are not kept for next runs
+        g.run_bench(2)
+        assert len(calls) == 2
+        g.run_test()
+        assert len(calls) == 3
+
+
+async def test_warmup_coroutine():
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    async def c(): ...
+    # coroutine object is run once: without cold call
+    with capture():
+        result = await bench_batch(c(), lambda: None, warmup=2)
+    assert result.ok
+
+
+def test_null_case():
+    params = [((1,), {})]
+    c = FunctionTestCase(test_bench_loop, params=params)
+    n = c.null_case()
+    assert n.name == 'null'
+    assert n.baseline_key == c.baseline_key
+    assert CoroutineFunctionTestCase(test_bench_loop, params=params).null_case().is_async
+
+
+def test_subtract_baseline():
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    def f(): ...
+    def g(): ...
+    def h(x): ...
+
+    with capture() as buf:
+        result = bench_batch(f, g, (h, (1,)), iterations=100, subtract_baseline=True)
+    assert result.ok
+    # one baseline for each call shape
+    assert [(b['name'], b['tests']) for b in result.baselines] == [('null', ['f', 'g']), ('null', ['h'])]
+    assert buf.getvalue().count('(subtracted)') == 2
+    # empty functions take the time of the baseline: it is subtracted & results are clamped at zero
+    for c in result.children:
+        assert min(c.samples) == .0 and c.stats['min'] == .0
+
+
+def test_stats():
+    st = Stats([1., 2., 3., 4., 100.])
+    assert (st.min, st.max, st.median, st.mad) == (1., 100., 3., 1.)
+    assert st.mean == 22.
+    assert st.outliers == 1
+    assert abs(st.p90 - 61.6) < 1e-9
+    assert st.warnings == ['noisy results (cv 198.3%)', '1 outlier(s)']
+
+
+def test_stats_table():
+    import time
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    calls = []
+
+    def f():
+        calls.append(1)
+        if len(calls) == 10:
+            time.sleep(.01)
+
+    with capture() as buf:
+        result = bench_batch(f, iterations=20, stats=True)
+    assert result.ok
+    assert tuple(result.children[0].stats) == Stats.HEADERS
+    header = next(line for line in buf.getvalue().splitlines() if 'median' in line)
+    assert [h.strip() for h in header.strip('¦ |').split('|')][:len(Stats.HEADERS)] == list(Stats.HEADERS)
+    # warnings line under the table
+    assert '! f: noisy results' in buf.getvalue()
+
+
+def test_process_spread():
+    assert process_spread([[1., 1.], [3., 3.]]) == (.0, 2 ** .5)
+    assert process_spread([[1., 3.], [1., 3.]]) == (2 ** .5, .0)
+
+
+def test_isolate():
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    calls = []
+
+    def f(): calls.append(1)
+
+    with capture() as buf:
+        result = bench_batch(f, iterations=3, isolate=2)
+    assert result.ok
+    # in forked processes
+    assert calls == []
+    c = result.children[0]
+    assert len(c.samples) == 6
+    assert (c.stats['in-proc sd'], c.stats['x-proc sd']) == process_spread([c.samples[:3], c.samples[3:]])
+    header = next(line for line in buf.getvalue().splitlines() if 'proc sd' in line)
+    assert [h.strip() for h in header.strip('¦ |').split('|')] == [
+        'full', 'max', 'min', 'avg', 'in-proc sd', 'x-proc sd', 'f', '%',
+    ]
+    # aligned with long headers
+    lines = buf.getvalue().splitlines()
+    row = lines[lines.index(header) + 1]
+    assert len(row) == len(header)
+
+
+def test_warmup():
+    w = Warmup(3)
+    assert [w.add(1.) for _ in range(3)] == [True, True, False]
+    w = Warmup('auto')
+    n = 0
+    while w.add((1. + n % 2) * 1e-6):
+        n += 1
+    assert w.count == Warmup.WINDOW * 2
+
+
+async def test_closed_loop():
+    in_flight = peak = 0
+
+    async def call():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0)
+        in_flight -= 1
+
+    elapsed, latencies = await closed_loop(call, 4, requests=10)
+    assert len(latencies) == 10 and peak == 4 and elapsed > 0
+
+
+def test_thread_loop():
+    idents = set()
+
+    def get_call():
+        return lambda: idents.add(threading.get_ident())
+
+    elapsed, latencies = thread_loop(get_call, 3, requests=30)
+    assert len(latencies) == 30 and elapsed > 0
+    assert 1 <= len(idents) <= 3
+
+    made = []
+
+    def bad_call():
+        made.append(1)
+        if len(made) == 2:
+            raise ValueError('call')
+        return lambda: None
+
+    # error of one call does not hang the others
+    try:
+        thread_loop(bad_call, 3, requests=3)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Call error is lost')
+
+
+async def test_load():
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    async def a(): await asyncio.sleep(0)
+    def f(): ...
+
+    with capture() as buf:
+        result = await bench_batch(a, f, iterations=2, load=[1, 4], load_requests=20)
+    assert result.ok
+    ra, rf = result.children
+    assert [(x['concurrency'], x['calls']) for x in ra.load] == [(1, 20), (4, 20)]
+    # only for coroutine functions
+    assert rf.load == []
+    out = buf.getvalue()
+    assert '| a x1 |' in out and '| a x4 |' in out and 'f x1' not in out
+    assert 'ops/s' in out
+
+
+async def test_threads():
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    async def a(): ...
+    def f(): ...
+
+    with capture() as buf:
+        result = await bench_batch(a, f, iterations=2, threads=[1, 2], load_requests=20)
+    assert result.ok
+    ra, rf = result.children
+    assert [(x['threads'], x['calls']) for x in rf.threads] == [(1, 20), (2, 20)]
+    assert rf.threads[0]['eff %'] == 100.
+    # only for sync functions
+    assert ra.threads == []
+    out = buf.getvalue()
+    assert '| f t1 |' in out and '| f t2 |' in out and 'a t1' not in out
+    assert 'eff %' in out
+
+
+def test_results():
+    import csv, gc, os, tempfile, warnings
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    def fail(): raise ValueError('fail')
+
+    with tempfile.TemporaryDirectory() as d, capture():
+        path = os.path.join(d, 'r.csv')
+        r = bench_batch(test_loops_range, fail, iterations=2, export=path)
+        with open(path) as f:
+            rows = list(csv.reader(f))
+    assert [c.name for _, c in r.cases()] == ['test_loops_range', 'fail']
+    assert not r.ok and r.children[0].ok and len(r.children[0].samples) == 2
+    assert rows[0][:3] == ['group', 'case', 'full'] and rows[2][-1] == 'ValueError: fail'
+
+    # files opened before a failed one are closed
+    with tempfile.TemporaryDirectory() as d, warnings.catch_warnings(record=True) as w:
+        warnings.simplefilter('always')
+        try:
+            bench_batch(test_loops_range, export=[os.path.join(d, 'r.csv'), os.path.join(d, 'no', 'r.md')])
+        except OSError:
+            pass
+        else:
+            raise AssertionError('Export error is lost')
+        gc.collect()
+    assert not [x for x in w if issubclass(x.category, ResourceWarning)]
+
+
+def test_history():
+    from cotests.cases.runner.utils.history import find_run, compare_runs
+    runs = [
+        {'tag': 'main', 'cases': {'a': {'median': 1., 'avg': 2.}, 'b': {'time': 1.}}},
+        {'tag': None, 'cases': {'a': {'median': 1.5, 'avg': 2.}, 'c': {'time': 1.}}},
+    ]
+    assert find_run(runs, 'main') is runs[0] and find_run(runs, '-1') is runs[1]
+    diffs, new, removed = compare_runs(runs[0], runs[1])
+    assert diffs == [('a', 1., 1.5, 50.)] and new == ['c'] and removed == ['b']
+    assert compare_runs(runs[0], runs[1], 'avg')[0] == [('a', 2., 2., .0)]
+
+
+def test_memory():
+    from cotests.cases.runner.utils.memory import trace_memory, format_bytes
+    keep = []
+    with trace_memory() as m:
+        [0] * 10000
+        keep.append(bytearray(4096))
+    assert m.peak > 80000 and 4096 <= m.retained < 8192 and m.blocks >= 1
+    assert format_bytes(10) == '10 B' and format_bytes(1536) == '1.500 KiB'
+
+
+def test_cpu_clock():
+    import time
+    clock = CpuClock()
+    time.sleep(.02)
+    proc, thread, ratio = clock.stop(2)
+    assert 0 <= proc < .005 and 0 <= thread < .005 and ratio < 50
+
+
+def test_gc_mode():
+    import gc
+    from cotests.cases.runner.utils.gc_control import gc_mode
+    with gc_mode('disable') as m:
+        assert not gc.isenabled()
+        gc.collect(1)
+    assert gc.isenabled() and m.collections == [0, 1, 0] and m.pause > 0
+    with gc_mode('freeze'):
+        assert gc.get_freeze_count()
+    assert not gc.get_freeze_count()
+
+
+def test_columns():
+    import csv, os, re, tempfile
+    from cotests import bench_batch
+    from cotests.logger import capture
+
+    keep = []
+
+    def f(): keep.append(bytearray(1000))
+
+    columns = ('cpu', 'thread', 'cpu %', 'gc0', 'gc1', 'gc2', 'gc pause', 'peak', 'retained', 'blocks')
+    # state of the runner is passed from isolated processes
+    for isolate in (0, 2):
+        with tempfile.TemporaryDirectory() as d, capture() as buf:
+            path = os.path.join(d, 'r.csv')
+            result = bench_batch(f, iterations=3, memory=True, cpu=True, gc='disable', isolate=isolate, export=path)
+            with open(path) as fr:
+                header, row = list(csv.reader(fr))
+        assert result.ok
+        stats = result.children[0].to_dict()['stats']
+        row = dict(zip(header, row))
+        for c in columns:
+            assert float(row[c]) == stats[c]
+        assert stats['retained'] >= 1000 and stats['blocks'] >= 1 and stats['peak'] >= stats['retained']
+        assert stats['cpu'] >= 0 and stats['gc0'] == 0
+        # utilization is not truncated
+        assert re.search(rf'\| +{stats["cpu %"]:.1f} \|', buf.getvalue())
+
+
+def test_profile():
+    import os, tempfile
+    from cotests.cases.runner.utils.profile import profile_path, profile_to, top_functions
+    with tempfile.TemporaryDirectory() as d:
+        file = profile_path(d, ('', 'g 1'), 'f')
+        assert file == os.path.join(d, 'g_1.f.pstats')
+        with profile_to(file):
+            sorted(range(1000), key=lambda x: -x)
+        rows = top_functions([file, file], 2)
+    assert len(rows) == 2 and any('<lambda>' in r[0] and r[3] == 2000 for r in rows)
+
+    # test mode: profiler & tracing only in the separate call
+    import sys, tracemalloc
+    from cotests import test_batch
+    from cotests.logger import capture
+    traced = []
+
+    def f():
+        traced.append((sys.getprofile() is not None, tracemalloc.is_tracing()))
+        sorted(range(100), key=lambda x: -x)
+
+    with tempfile.TemporaryDirectory() as d, capture() as buf:
+        result = test_batch(f, profile=d, profile_top=3, memory=True)
+        assert os.listdir(d) == ['f.pstats']
+    assert result.ok
+    assert traced == [(False, False), (True, False), (False, True)]
+    out = buf.getvalue()
+    assert f'profile of 1 case(s) in {d}; top by own time:' in out and '<lambda>' in out
+    assert 'own' in out and 'cumulative' in out and 'calls' in out
+
+
+def test_stack_sampler():
+    import os
+    import sys
+    import tempfile
+    import time
+    from cotests import bench_batch
+    from cotests.cases.runner.utils.profile import StackSampler
+    from cotests.logger import capture
+
+    def busy():
+        end = time.perf_counter() + .05
+        while time.perf_counter() < end:
+            ...
+
+    with StackSampler(.001) as sampler:
+        busy()
+    assert any('busy (t_bench.py' in stack for stack in sampler.counts)
+
+    # not while timing: separate pass
+    switch = sys.getswitchinterval()
+    seen = []
+
+    def f():
+        seen.append(sys.getswitchinterval())
+
+    with tempfile.TemporaryDirectory() as d, capture():
+        bench_batch(f, iterations=3, sampling=d, sampling_interval=switch / 2)
+        assert os.listdir(d)
+    assert seen == [switch] * 3 + [switch / 2] * 3
+
+
+def test_complexity():
+    from cotests.cases.runner.utils.complexity import fit_complexity
+    sizes = [10, 100, 1000, 10000]
+    assert fit_complexity(sizes, [1e-6] * 4)[0].name == 'O(1)'
+    assert fit_complexity(sizes, [1e-6 + 1e-9 * n for n in sizes])[0].name == 'O(n)'
+    assert fit_complexity(sizes, [1e-6 + 1e-9 * n * n for n in sizes])[0].name == 'O(n^2)'
+    # empty input
+    assert fit_complexity([0, *sizes], [1e-6 + 1e-9 * n for n in [0, *sizes]])[0].name == 'O(n)'
+
+
+def test_sweep():
+    from cotests import CoTestGroup
+    from cotests.logger import capture
+
+    inputs = []
+
+    def f(x, y):
+        assert y == 1 and len(x) in (1, 2, 4)
+
+    group = CoTestGroup(
+        f, global_args=(1,), sweep=[1, 2, 4], sweep_input=lambda n: inputs.append(n) or [0] * n, name='g',
+    )
+    # built with its case on run
+    assert inputs == []
+    with capture():
+        result = group.run_bench(2)
+    assert result.ok
+    assert [c.name for c in result.children] == ['f[1]', 'f[2]', 'f[4]']
+    assert inputs == [1, 2, 4]
+    assert 'f' in result.complexity
+
+
+def test_grid():
+    import os
+    import tempfile
+    from itertools import islice
+    from cotests import CoTestGroup, Grid, test_groups
+    from cotests.logger import capture
+
+    grid = Grid(a=range(1000), b=range(1000)) * Grid.zip(c='xy', d=(1, 2))
+    assert len(grid) == 2_000_000
+    assert next(iter(grid)) == {'a': 0, 'b': 0, 'c': 'x', 'd': 1}
+
+    calls = []
+
+    def f(*args, **kwargs):
+        calls.append((args, kwargs))
+
+    g = CoTestGroup(f, global_kwargs={'e': 0}, grid=grid)
+    # cases are created while iterating
+    cases = list(islice(g.tests, 3))
+    assert [c.name for c in cases] == ['f[a=0,b=0,c=x,d=1]', 'f[a=0,b=0,c=y,d=2]', 'f[a=0,b=1,c=x,d=1]']
+    cases[1].run_test()
+    assert calls == [((), {'e': 0, 'a': 0, 'b': 0, 'c': 'y', 'd': 2})]
+    assert cases[0].baseline_key == cases[2].baseline_key
+
+    # not reordered: cases are still created while running
+    created, seen = [], []
+
+    def g(x, a):
+        seen.append(len(created))
+
+    with tempfile.TemporaryDirectory() as d, capture():
+        for order in ('failed', 'slowest'):
+            created.clear()
+            seen.clear()
+            group = CoTestGroup(g, grid=Grid(a=range(1000)), sweep=[1], sweep_input=created.append, name='g')
+            test_groups(group, order=order, timings=os.path.join(d, 'timings.json'))
+            assert seen[:3] == [1, 2, 3]
+
+
+def test_source():
+    import json
+    import os
+    import tempfile
+    from cotests import CoTestGroup, Source, bench_batch, test_batch
+    from cotests.logger import capture
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'records.jsonl')
+        with open(path, 'w') as f:
+            f.write('\n'.join(json.dumps(r) for r in ([1], {'b': 2}, [3, 4])))
+        assert list(Source.jsonl(path)) == [[1], {'b': 2}, [3, 4]]
+        got = []
+
+        def g(a=0, b=0, c=0):
+            got.append((a, b, c))
+
+        # list - args, dict - kwargs
+        with capture():
+            assert test_batch(g, personal_args=Source.jsonl(path)).ok
+            assert test_batch(g, personal_kwargs=Source.jsonl(path), global_kwargs={'c': 5}).ok
+        assert got == [(1, 0, 0), (0, 2, 0), (3, 4, 0), (1, 0, 5), (0, 2, 5), (3, 4, 5)]
+
+        path = os.path.join(d, 'records.bin')
+        with open(path, 'wb') as f:
+            f.write(b'\x02\x00\x00\x00ab\x00\x00\x00\x00\x01\x00\x00\x00c')
+        assert list(Source.mmap(path)) == [(b'ab',), (b'',), (b'c',)]
+        assert list(Source.mmap(path, 5)) == [(b'\x02\x00\x00\x00a',), (b'b\x00\x00\x00\x00',), (b'\x01\x00\x00\x00c',)]
+
+    opens, calls = [], []
+
+    def records(n):
+        opens.append(n)
+        yield from ((i,) for i in range(n))
+
+    def f(x, a=0):
+        calls.append((x, a))
+
+    with capture():
+        result = bench_batch(f, iterations=3, personal_args=Source(records, 4), global_kwargs={'a': 1})
+    assert result.ok
+    assert opens == [4] * 3
+    assert calls == [(i, 1) for i in range(4)] * 3
+
+    # single pass of iterator; different length of streams
+    case, = CoTestGroup(f, personal_args=iter([(1,)])).tests
+    case.run_test()
+    try:
+        case.run_test()
+    except AssertionError:
+        ...
+    else:
+        raise AssertionError('Iterator is used twice')
+    case, = CoTestGroup(f, personal_args=Source(records, 2), personal_kwargs=iter([{}])).tests
+    try:
+        case.run_test()
+    except AssertionError as e:
+        assert 'different length' in str(e)
+    else:
+        raise AssertionError('Different length')
+
+
+if __name__ == '__main__':
+    from cotests import test_batch
+    test_batch(
+        test_loops_range, test_bench_loop, test_calibrate_reset, test_warmup_coroutine,
+        test_null_case, test_stats, test_stats_table, test_process_spread, test_isolate, test_warmup,
+        test_subtract_baseline, test_closed_loop, test_thread_loop, test_load, test_threads, test_results,
+        test_history, test_memory, test_cpu_clock, test_columns,
+        test_gc_mode, test_profile, test_stack_sampler,
+        test_complexity, test_sweep, test_grid, test_source,
+    )
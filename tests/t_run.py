@@ -0,0 +1,357 @@
+import pickle
+from typing import Dict
+
+from cotests.exceptions import CoException, WorkerError
+from cotests.logger import logger, capture
+
+
+class NotPicklableError(Exception):
+    def __init__(self, msg: str):
+        super().__init__(msg)
+        self.callback = lambda: msg
+
+
+def test_picklable_errors():
+    e = CoException([
+        ValueError('v'),
+        CoException([NotPicklableError('np')], 'inner'),
+    ], 'outer')
+    errors = list(pickle.loads(pickle.dumps(e.picklable())).errors)
+    assert [ep for ep, _ in errors] == [(), ('inner',)]
+    assert isinstance(errors[0][1], ValueError)
+    assert isinstance(errors[1][1], WorkerError)
+    assert (errors[1][1].type_name, str(errors[1][1])) == ('NotPicklableError', 'np')
+
+
+def test_capture():
+    with capture() as buf:
+        logger.child.writeln('captured')
+    assert buf.getvalue() == '¦ captured\n'
+
+
+async def test_concurrency():
+    import asyncio
+    from cotests import test_batch
+
+    in_flight = peak = 0
+
+    async def sleep():
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(.05)
+        in_flight -= 1
+
+    with capture():
+        result = await test_batch(*[sleep] * 6, concurrency=3)
+    assert result.ok
+    assert peak == 3
+    # 2 rounds of 3 sleeps
+    assert result.time < .05 * 4
+
+
+async def test_fixtures():
+    from cotests import CoTestGroup, fixture, test_groups
+
+    log = []
+
+    @fixture(scope='session')
+    def session():
+        log.append('+session')
+        yield 'S'
+        log.append('-session')
+
+    @fixture
+    def group():
+        log.append('+group ' + session())
+        yield 'G'
+        log.append('-group')
+
+    @fixture(scope='module')
+    async def module():
+        log.append('+module')
+        return 'M'
+
+    def test_0(): assert (group(), session()) == ('G', 'S')
+    async def test_a0(): assert (await module(), group()) == ('M', 'G')
+
+    with capture():
+        result = await test_groups(CoTestGroup(test_0, test_0, name='g0'), CoTestGroup(test_a0, test_a0, name='g1'))
+    assert result.ok
+    assert log == ['+session', '+group S', '-group', '+module', '+group S', '-group', '-session']
+
+
+async def test_fixtures_workers():
+    import os
+    import tempfile
+    from cotests import fixture, test_batch
+
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, 'log')
+
+        def write(line: str):
+            # from worker processes
+            with open(path, 'a') as f:
+                f.write(line + '\n')
+
+        @fixture(scope='session')
+        async def res():
+            write('+res')
+            yield 'R'
+            write('-res')
+
+        async def test_a0(): assert await res() == 'R'
+        async def test_a1(): assert await res() == 'R'
+
+        with capture():
+            result = await test_batch(test_a0, test_a1, workers=2)
+        assert result.ok
+        with open(path) as f:
+            assert sorted(f.read().split()) == ['+res', '+res', '-res', '-res']
+
+
+def test_fixtures_threads():
+    from cotests import bench_batch, fixture
+
+    created = []
+
+    @fixture
+    def res():
+        created.append(1)
+        return 'R'
+
+    def f(): assert res() == 'R'
+
+    with capture():
+        result = bench_batch(f, threads=[4], load_requests=20)
+    assert result.ok
+    assert created == [1]
+
+
+def test_incremental():
+    import os
+    import sys
+    import tempfile
+    from cotests import test_module
+
+    with tempfile.TemporaryDirectory() as d:
+        def write(name: str, code: str):
+            with open(os.path.join(d, name), 'w') as f:
+                f.write(code)
+
+        write('lib_inc.py', 'X = 1\n')
+        write('t_0.py', 'from lib_inc import X\ndef test_0(): assert X == 1\n')
+        write('t_1.py', 'import os\ndef test_1(): assert not os.environ.get("T_INC_FAIL")\n')
+        cache = os.path.join(d, 'cache.json')
+
+        def run(**kwargs):
+            with capture():
+                result = test_module(d, incremental=cache, **kwargs)
+            return sorted(r.name for r in result.children)
+
+        sys.path.insert(0, d)
+        os.environ['T_INC_FAIL'] = '1'
+        try:
+            assert run() == ['t_0.py', 't_1.py']
+            del os.environ['T_INC_FAIL']
+            # failed before
+            assert run() == ['t_1.py']
+            assert run() == []
+            # imported module is changed
+            write('lib_inc.py', 'X = 1\nY = 2\n')
+            assert run() == ['t_0.py']
+            # failed first: results are matched with files by name
+            os.environ['T_INC_FAIL'] = '1'
+            write('t_1.py', 'import os\ndef test_1(): assert not os.environ.get("T_INC_FAIL")\n\n')
+            write('t_0.py', 'from lib_inc import X\ndef test_0(): assert X == 1\n\n')
+            timings = os.path.join(d, 'timings.json')
+            assert run(timings=timings) == ['t_0.py', 't_1.py']
+            write('t_0.py', 'from lib_inc import X\ndef test_0(): assert X == 1\n\n\n')
+            assert run(order='failed', timings=timings) == ['t_0.py', 't_1.py']
+            assert run(order='failed', timings=timings) == ['t_1.py']
+            # selected tests only: the file is not fresh
+            write('t_2.py', 'def test_a(): assert 0\ndef test_b(): ...\n')
+            assert run(select=['t_2.py::test_b']) == ['t_2.py']
+            assert run(select=['t_2.py::*']) == ['t_2.py']
+        finally:
+            os.environ.pop('T_INC_FAIL', None)
+            sys.path.remove(d)
+            sys.modules.pop('lib_inc', None)
+
+
+async def test_discovery():
+    import os
+    import tempfile
+    from cotests import list_tests, test_module
+    from cotests.discovery import find_files
+
+    with tempfile.TemporaryDirectory() as d:
+        log = os.path.join(d, 'imports.log')
+
+        def write(name: str, code: str):
+            os.makedirs(os.path.dirname(os.path.join(d, name)), exist_ok=True)
+            with open(os.path.join(d, name), 'w') as f:
+                f.write(f'with open({log!r}, "a") as f_: f_.write("{name}\\n")\n' + code)
+
+        def imports():
+            with open(log) as f:
+                imported = f.read().split()
+            os.remove(log)
+            return imported
+
+        write('t_0.py', 'def test_0(): ...\ndef test_1(): ...\n')
+        write('a/t_1.py', 'async def test_a(): ...\n')
+        write('a/b/t_2.py', 'def test_2(): ...\n')
+        write('.c/t_3.py', 'def test_3(): ...\n')
+
+        assert [r for r, _ in find_files(d)] == ['t_0.py']
+        assert [r for r, _ in find_files(d, recursive=True)] == ['a/b/t_2.py', 'a/t_1.py', 't_0.py']
+        assert [r for r, _ in find_files(d, recursive=True, include=['a/*'], exclude=['*/b/*'])] == ['a/t_1.py']
+
+        index = os.path.join(d, 'index.json')
+        ids = list_tests(d, recursive=True, index=index, workers=2)
+        assert ids == ['a/b/t_2.py::test_2', 'a/t_1.py::test_a', 't_0.py::test_0', 't_0.py::test_1']
+        assert sorted(imports()) == ['a/b/t_2.py', 'a/t_1.py', 't_0.py']
+        # from the index
+        assert list_tests(d, recursive=True, index=index, select=['*::test_a', '*::test_1']) == [
+            'a/t_1.py::test_a', 't_0.py::test_1'
+        ]
+        assert not os.path.exists(log)
+
+        with capture():
+            result = await test_module(d, recursive=True, index=index, select=['*::test_a', '*::test_1'])
+        assert [[c.name for c in g.children] for g in result.children] == [['test_a'], ['test_1']]
+        # only selected files
+        assert imports() == ['a/t_1.py', 't_0.py']
+
+
+def test_order():
+    import os
+    import tempfile
+    import time
+    from cotests import CoTestGroup, test_groups
+
+    log = []
+    failed = {'t_fast'}
+
+    def case(name: str, sec: float):
+        def f():
+            log.append(name)
+            time.sleep(sec)
+            assert name not in failed
+        f.__name__ = name
+        return f
+
+    with tempfile.TemporaryDirectory() as d:
+        timings = os.path.join(d, 'timings.json')
+
+        def run(order: str, *extra):
+            log.clear()
+            group = CoTestGroup(
+                case('t_mid', .01), case('t_fast', 0), CoTestGroup(case('t_slow', .03), name='g'), *extra,
+                name='root',
+            )
+            with capture():
+                test_groups(group, order=order, timings=timings)
+            return log[:]
+
+        assert run('declared') == ['t_mid', 't_fast', 't_slow']
+        # nested group by its time
+        assert run('slowest') == ['t_slow', 't_mid', 't_fast']
+        assert run('failed') == ['t_fast', 't_mid', 't_slow']
+        failed.clear()
+        # new tests first
+        assert run('fastest', case('t_new', 0)) == ['t_new', 't_fast', 't_mid', 't_slow']
+        assert run('failed') == ['t_mid', 't_fast', 't_slow']
+
+
+def test_shard():
+    import os
+    import tempfile
+    from cotests import test_module
+    from cotests.cases.runner.utils.shard import merge_reports, parse_shard, split
+
+    assert parse_shard('2/8') == (2, 8)
+    ids = [f't_{i}.py' for i in range(6)]
+    # by hash: the same on each node
+    assert split(ids, 3) == split(ids, 3)
+    assert sorted(sum(split(ids, 3), [])) == ids
+    # by durations: 5 + 0, 4 + 1, 3 + 2; unknown file takes the mean: 2.5
+    durations = {f't_{i}.py': float(i) for i in range(6)}
+    assert split(ids, 3, durations) == [['t_0.py', 't_5.py'], ['t_1.py', 't_4.py'], ['t_2.py', 't_3.py']]
+    assert split([*ids, 't_new.py'], 3, durations) == [
+        ['t_1.py', 't_5.py'], ['t_2.py', 't_4.py'], ['t_0.py', 't_3.py', 't_new.py']
+    ]
+
+    with tempfile.TemporaryDirectory() as d:
+        for i in range(4):
+            with open(os.path.join(d, f't_{i}.py'), 'w') as f:
+                f.write(f'def test_{i}(): assert {i} != 2, "bad"\n')
+        reports = [os.path.join(d, f'shard-{i}.json') for i in (1, 2)]
+        with capture():
+            for i, report in enumerate(reports, 1):
+                test_module(d, shard=f'{i}/2', report=report)
+
+        result = merge_reports(reports)
+        # as a single run
+        assert [c.name for c in result.children] == ['t_0.py', 't_1.py', 't_2.py', 't_3.py']
+        assert [(p, t, m) for p, t, m in result.errors] == [(('t_2.py', 'test_2'), 'AssertionError', 'bad')]
+        try:
+            merge_reports(reports[:1])
+        except ValueError:
+            pass
+        else:
+            raise AssertionError('Missing shard is not found')
+
+
+# cumulative time of `import cotests`, sec; it was ~.2 with all features imported
+IMPORT_BUDGET = .02
+
+
+def _import_time(code: str) -> Dict[str, int]:
+    """Cumulative import time of each module, us: `python -X importtime`"""
+    import os
+    import subprocess
+    import sys
+    import cotests
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(cotests.__file__))),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True,
+    )
+    modules = {}
+    for line in res.stderr.splitlines():
+        if line.startswith('import time:') and not line.endswith('package'):
+            _, cumulative, name = line[12:].split('|')
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def test_import_time():
+    # the best of a few runs: the first one may compile sources
+    best = min(_import_time('import cotests')['cotests'] for _ in range(3)) / 1e6
+    assert best < IMPORT_BUDGET, f'import cotests: {best:.4f} sec'
+
+
+def test_lazy_imports():
+    heavy = ('asyncio', 'unittest', 'multiprocessing', 'concurrent.futures.process', 'json', 'tracemalloc')
+    modules = _import_time('import cotests')
+    assert set(modules) & {'typing', 'inspect', *heavy} == set()
+
+    modules = _import_time('from cotests import test_batch\ntest_batch(lambda: None, lambda: 1)')
+    assert set(modules) & set(heavy) == set()
+    modules = _import_time('from cotests import test_batch\nasync def f(): ...\ntest_batch(f)')
+    assert 'asyncio' in modules and 'unittest' not in modules
+    modules = _import_time('import unittest\nfrom cotests import test_batch\n'
+                           'class T(unittest.TestCase):\n def test_0(self): ...\ntest_batch(T)')
+    assert 'asyncio' not in modules
+
+
+if __name__ == '__main__':
+    from cotests import test_batch
+    test_batch(
+        test_picklable_errors, test_capture, test_concurrency,
+        test_fixtures, test_fixtures_workers, test_fixtures_threads,
+        test_incremental, test_discovery, test_order, test_shard,
+        test_import_time, test_lazy_imports,
+    )